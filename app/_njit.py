@@ -0,0 +1,40 @@
+"""
+Optional Numba JIT.
+
+``njit`` is numba's decorator when numba is installed and a transparent no-op otherwise,
+so kernels decorated with it stay importable (and correct, just slower) without numba.
+Callers that have a faster pure-NumPy path can branch on ``HAS_NUMBA``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+_numba_njit: Optional[Callable[..., Any]]
+
+try:
+    from numba import njit as _numba_njit
+
+    HAS_NUMBA = True
+except Exception:  # pragma: no cover - optional dependency
+    _numba_njit = None
+    HAS_NUMBA = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Any:
+    """``numba.njit`` when available; otherwise return the function unchanged.
+
+    Supports both ``@njit`` and ``@njit(cache=True, ...)`` forms.
+    """
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def _wrap(fn: Callable[..., Any]) -> Callable[..., Any]:
+        return fn
+
+    return _wrap
+
+
+__all__ = ["HAS_NUMBA", "njit"]
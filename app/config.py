@@ -273,6 +273,7 @@ AUDIT_SAMPLE_TAIL_N = int(os.getenv("AUDIT_SAMPLE_TAIL_N", "24"))
 AUDIT_MAX_LEVELS = int(os.getenv("AUDIT_MAX_LEVELS", "10"))
 
 # Structured telemetry switches
+TELEMETRY_ENABLED = _bool(os.getenv("TASER_TELEMETRY", "1"))
 TELEMETRY_JSON_IN_STATUS = _bool(os.getenv("TELEMETRY_JSON_IN_STATUS", "true"))
 TELEMETRY_MFE_MAE = _bool(os.getenv("TELEMETRY_MFE_MAE", "true"))
 ANALYTICS_TRACK_PEAKS = _bool(os.getenv("ANALYTICS_TRACK_PEAKS", "true"))
@@ -666,8 +667,6 @@ except Exception:
 LEDGER_BACKEND = os.getenv("LEDGER_BACKEND", "duckdb")
 LEDGER_PATH = os.getenv("LEDGER_PATH", "ledger.duckdb")
 
-DELTA_API_KEY = os.getenv("DELTA_API_KEY", "")
-DELTA_API_SECRET = os.getenv("DELTA_API_SECRET", "")
 DELTA_ENDPOINT = os.getenv("DELTA_ENDPOINT", "https://api.delta.exchange")
 
 RUN_TRAINER_NIGHTLY = os.getenv("RUN_TRAINER_NIGHTLY", "true").lower() == "true"
@@ -2,9 +2,10 @@
 import json
 import time
 from importlib import import_module
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, cast
 
 import ccxt
+import numpy as np
 
 from . import config as C
 
@@ -253,6 +254,115 @@ def fetch_ohlcv(
     return _empty_dict()
 
 
+_OHLCV_KEYS = ("open", "high", "low", "close", "volume")
+
+
+class OhlcvRing:
+    """Rolling ``cap``-bar OHLCV window for one timeframe, refreshed incrementally.
+
+    The first ``update`` fetches the whole window; later ones fetch only the newest
+    ``tail`` bars and merge them by timestamp (the forming bar is overwritten, a new bar
+    replaces the oldest slot of the ring). The full window is fetched again every
+    ``refetch_every`` new bars, so exchange-side revisions of older bars are picked up,
+    and whenever the tail does not join up with the window (missed bars, unknown
+    timeframe, empty reply). Columns are kept as float64 ring buffers starting at
+    ``head``; ``update`` returns the usual dict of lists.
+    """
+
+    __slots__ = (
+        "tf",
+        "cap",
+        "tail",
+        "refetch_every",
+        "step_ms",
+        "ts",
+        "cols",
+        "head",
+        "n",
+        "fresh",
+    )
+
+    def __init__(self, tf: str, cap: int, tail: int = 3, refetch_every: int = 60) -> None:
+        self.tf = tf
+        self.cap = max(1, int(cap))
+        self.tail = max(2, int(tail))
+        self.refetch_every = max(1, int(refetch_every))
+        self.step_ms = _TIMEFRAME_SECONDS.get(tf, 0) * 1000
+        self.ts = np.zeros(self.cap, dtype=np.int64)
+        self.cols = np.zeros((len(_OHLCV_KEYS), self.cap), dtype=np.float64)
+        self.head = 0  # physical slot of the oldest bar
+        self.n = 0
+        self.fresh = 0  # bars appended since the last full fetch
+
+    def update(self, fetch: Callable, ex: Any) -> Dict[str, List[float]]:
+        """Refresh from ``fetch(ex, tf, limit)`` and return the current window."""
+        if (
+            self.n
+            and self.step_ms
+            and self.fresh < self.refetch_every
+            and self._merge(fetch(ex, self.tf, self.tail))
+        ):
+            return self.as_dict()
+        rows = fetch(ex, self.tf, self.cap)
+        stamps = rows.get("timestamp") or []
+        k = min(len(stamps), self.cap)
+        self.head = self.n = self.fresh = 0
+        if not k or stamps[-1] < stamps[-k]:
+            # Nothing to keep, or not oldest-first: pass the reply through untouched
+            return rows
+        self.ts[:k] = stamps[-k:]
+        for i, key in enumerate(_OHLCV_KEYS):
+            col = rows.get(key) or []
+            self.cols[i, :k] = col[-k:] if len(col) >= k else 0.0
+        self.n = k
+        return self.as_dict()
+
+    def _merge(self, rows: Dict[str, List[float]]) -> bool:
+        stamps = rows.get("timestamp") or []
+        if not stamps:
+            return False
+        vals = [rows.get(key) or [0.0] * len(stamps) for key in _OHLCV_KEYS]
+        step, cap, ts, cols = self.step_ms, self.cap, self.ts, self.cols
+        for j in sorted(range(len(stamps)), key=stamps.__getitem__):
+            t = int(stamps[j])
+            last = int(ts[(self.head + self.n - 1) % cap])
+            if t <= last:
+                # Bar already in the window: refresh it in place
+                back = (last - t) // step
+                if back >= self.n:
+                    continue
+                k = (self.head + self.n - 1 - back) % cap
+                if ts[k] != t:
+                    continue
+            elif t - last == step:
+                if self.n == cap:
+                    # Overwrite the oldest slot; it becomes the newest
+                    k = self.head
+                    self.head = (self.head + 1) % cap
+                else:
+                    k = (self.head + self.n) % cap
+                    self.n += 1
+                self.fresh += 1
+                ts[k] = t
+            else:
+                return False
+            for i in range(len(_OHLCV_KEYS)):
+                cols[i, k] = vals[i][j]
+        return True
+
+    def as_dict(self) -> Dict[str, List[float]]:
+        n, h = self.n, self.head
+        if h + n <= self.cap:
+            ts, cols = self.ts[h : h + n], self.cols[:, h : h + n]
+        else:
+            idx = (h + np.arange(n)) % self.cap
+            ts, cols = self.ts[idx], self.cols[:, idx]
+        out: Dict[str, List[float]] = {"timestamp": ts.tolist()}
+        for i, key in enumerate(_OHLCV_KEYS):
+            out[key] = cols[i].tolist()
+        return out
+
+
 def fetch_balance_quote(ex, pair: str) -> float:
     try:
         quote = quote_from_pair(pair)
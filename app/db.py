@@ -9,6 +9,8 @@ from . import config as C
 def init():
     con = sqlite3.connect(C.DB_PATH)
     cur = con.cursor()
+    # Only effective on a fresh DB file; maintenance.purge_sqlite converts existing ones.
+    cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
     cur.execute(
         """CREATE TABLE IF NOT EXISTS trades(
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -24,6 +26,7 @@ def init():
         price REAL, qty REAL, status TEXT, created_ts INTEGER
     )"""
     )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_trade ON orders(trade_id)")
     cur.execute(
         """CREATE TABLE IF NOT EXISTS events(
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -182,6 +185,18 @@ def add_order(tid: int, oid: str, typ: str, side: str, price: float, qty: float,
             VALUES(?,?,?,?,?,?,?,?)""",
         (tid, oid, typ, side, price, qty, status, now),
     )
+
+
+def get_orders(trade_id: int) -> list[dict]:
+    """Orders recorded for trade_id, oldest first (kind = orders.type, id = orders.order_id)."""
+    rows = query(
+        "SELECT order_id,type,side,price,qty,status FROM orders WHERE trade_id=? ORDER BY id",
+        (int(trade_id),),
+    )
+    return [
+        {"id": r[0], "kind": r[1], "side": r[2], "price": r[3], "qty": r[4], "status": r[5]}
+        for r in rows
+    ]
     # --- add near your existing init/create functions ---
 
 
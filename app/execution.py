@@ -1,8 +1,9 @@
 # app/execution.py
 import json
+import threading
 import time
 import uuid
-from types import SimpleNamespace
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, List, Optional, cast
 
 if TYPE_CHECKING:
@@ -19,6 +20,31 @@ from .managers.trendscalp_fsm import build_entry_validity_snapshot
 # --- helpers ---
 
 
+@dataclass(slots=True)
+class PEVCtx:
+    """Minimal duck-typed stand-in for PEVContext used by entry-validity snapshots."""
+
+    is_long: bool
+    price: float
+    meta: dict = field(default_factory=dict)
+
+
+_TL = threading.local()
+
+
+def _pev_ctx(is_long: bool, price: float) -> PEVCtx:
+    """Return this thread's reusable PEVCtx, refreshed for the given side/price.
+    build_entry_validity_snapshot is pure, so sharing one instance per thread is safe.
+    """
+    ctx = getattr(_TL, "ctx", None)
+    if ctx is None:
+        ctx = _TL.ctx = PEVCtx(False, 0.0, {})
+    ctx.is_long = is_long
+    ctx.price = price
+    ctx.meta["ts"] = time.time()
+    return ctx
+
+
 def _oid(kind: str) -> str:
     """Generate a stable-looking paper order id."""
     try:
@@ -27,9 +53,17 @@ def _oid(kind: str) -> str:
         return f"paper-{kind}-{int(time.time())}"
 
 
+class Rounded(float):
+    """Price already rounded by _round_px; re-rounding it is a no-op."""
+
+    __slots__ = ()
+
+
 def _round_px(x: float) -> float:
+    if isinstance(x, Rounded):
+        return x
     try:
-        return round(float(x), 4)
+        return Rounded(round(float(x), 4))
     except Exception:
         return x
 
@@ -88,7 +122,8 @@ def _parse_structured_tps(sig_tps, qty: float):
         fracs = []
         for it in tps:
             try:
-                px = _round_px(float(it.get("px")))
+                px = it.get("px")
+                px = px if isinstance(px, Rounded) else _round_px(float(px))
                 frac = float(it.get("size_frac", 0.0))
             except Exception:
                 continue
@@ -106,7 +141,7 @@ def _parse_structured_tps(sig_tps, qty: float):
     levels = []
     for x in tps:
         try:
-            levels.append(_round_px(float(x)))
+            levels.append(x if isinstance(x, Rounded) else _round_px(float(x)))
         except Exception:
             pass
     return (levels if levels else []), [], False
@@ -365,11 +400,7 @@ def place_bracket(ex: ccxt.Exchange, symbol: str, sig, qty: float, trade_id: int
     try:
         feats5 = _meta.get("feats_5m") or _meta.get("feats") or {}
         if isinstance(feats5, dict) and feats5:
-            ctx0 = SimpleNamespace(
-                is_long=(sig.side == "LONG"),
-                price=entry_px,
-                meta={"ts": time.time()},
-            )
+            ctx0 = _pev_ctx(sig.side == "LONG", entry_px)
             _meta["entry_validity"] = build_entry_validity_snapshot(
                 cast("PEVContext", ctx0), feats5
             )
@@ -800,11 +831,7 @@ def reenter_from_recovery(
         try:
             feats5 = _meta.get("feats_5m") or _meta.get("feats") or {}
             if isinstance(feats5, dict) and feats5:
-                ctx0 = SimpleNamespace(
-                    is_long=(sig.side == "LONG"),
-                    price=float(getattr(sig, "entry")),
-                    meta={"ts": time.time()},
-                )
+                ctx0 = _pev_ctx(sig.side == "LONG", float(getattr(sig, "entry")))
                 _meta["entry_validity"] = build_entry_validity_snapshot(
                     cast("PEVContext", ctx0), feats5
                 )
@@ -1,51 +1,139 @@
 from typing import List, Optional, Tuple, Union
 
+import numpy as np
+
+from ._njit import HAS_NUMBA, njit
+
+try:
+    from scipy.signal import lfilter as _lfilter
+except Exception:  # pragma: no cover - optional dependency
+    _lfilter = None
+
 """Core technical indicators with Ruff-friendly style."""
 
 Number = Union[int, float]
 
 
-def ema(values: List[float], length: int) -> List[float]:
-    """Exponential moving average.
+_pd = None
+
+
+def _pandas():
+    """Import pandas on first use (keeps ``import app.indicators`` light)."""
+    global _pd
+    if _pd is None:
+        import pandas
 
-    Returns a list the same length as ``values``.
+        _pd = pandas
+    return _pd
+
+
+def ema(values: List[float], length: int) -> np.ndarray:
+    """Exponential moving average (seeded with the first value).
+
+    Returns an array the same length as ``values``.
     """
     k = 2 / (length + 1)
-    e: Optional[float] = None
-    out: List[float] = []
-    for v in values:
-        e = v if e is None else e + k * (v - e)
-        out.append(float(e))
-    return out
+    s = _pandas().Series(values, dtype="float64")
+    return s.ewm(alpha=k, adjust=False).mean().to_numpy()
 
 
-def rsi(closes: List[float], length: int = 14) -> List[Optional[float]]:
-    """Relative Strength Index (Wilder).
+def as_f64(values: Union[List[Number], np.ndarray], m: Optional[int] = None) -> np.ndarray:
+    """Cast once to a contiguous float64 array (no copy if already one), optionally ``[:m]``."""
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    return arr if m is None else arr[:m]
 
-    Returns a list the same length as ``closes`` with ``None`` until enough points.
+
+def last_or_none(arr: np.ndarray) -> Optional[float]:
+    """Last element of an indicator array as a float, or ``None`` if empty/undefined."""
+    if len(arr) == 0:
+        return None
+    v = float(arr[-1])
+    return None if v != v else v
+
+
+def ewm_iir(x: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """Recursive EWM ``a = a + alpha * (x_i - a)`` over ``x``, starting from ``seed``.
+
+    Runs as a single C-level IIR filter when scipy is available, else via pandas' ewm.
     """
-    if len(closes) < length + 1:
-        return [None] * len(closes)
+    if _lfilter is not None:
+        out, _ = _lfilter([alpha], [1.0, alpha - 1.0], x, zi=[seed * (1.0 - alpha)])
+        return out
+    # Prepend the seed so ewm(adjust=False) starts from it, then drop it again
+    s = _pandas().Series(np.concatenate(([seed], x)))
+    return s.ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+
+def wilder(x: np.ndarray, seed: float, length: int) -> np.ndarray:
+    """Wilder smoothing ``a = (a * (length - 1) + x_i) / length`` over ``x`` from ``seed``."""
+    return ewm_iir(x, 1.0 / length, seed)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _rsi_loop(closes: np.ndarray, length: int) -> np.ndarray:
+    """Single-pass Wilder RSI kernel; same contract as ``_rsi_np``."""
+    m = closes.shape[0]
+    avg_g = 0.0
+    avg_l = 0.0
+    for i in range(1, length + 1):
+        ch = closes[i] - closes[i - 1]
+        if ch > 0.0:
+            avg_g += ch
+        else:
+            avg_l -= ch
+    avg_g /= length
+    avg_l /= length
+    out = np.empty(max(0, m - length - 1))
+    for i in range(length + 1, m):
+        ch = closes[i] - closes[i - 1]
+        g = ch if ch > 0.0 else 0.0
+        lo = -ch if ch < 0.0 else 0.0
+        avg_g = (avg_g * (length - 1) + g) / length
+        avg_l = (avg_l * (length - 1) + lo) / length
+        rs = (avg_g / avg_l) if avg_l != 0.0 else 100.0
+        out[i - length - 1] = 100.0 - (100.0 / (1.0 + rs))
+    return out
 
-    gains: List[float] = []
-    losses: List[float] = []
-    for i in range(1, len(closes)):
-        ch = float(closes[i]) - float(closes[i - 1])
-        gains.append(max(ch, 0.0))
-        losses.append(max(-ch, 0.0))
 
-    avg_g = sum(gains[:length]) / length
-    avg_l = sum(losses[:length]) / length
+def _rsi_np(closes: np.ndarray, length: int) -> np.ndarray:
+    """RSI values for bars ``length + 1 ..`` (caller guarantees enough points)."""
+    if HAS_NUMBA:
+        return _rsi_loop(closes, length)
+    d = np.diff(closes)
+    g = np.maximum(d, 0.0)
+    lo = np.maximum(-d, 0.0)
+    ag = wilder(g[length:], float(g[:length].mean()), length)
+    al = wilder(lo[length:], float(lo[:length].mean()), length)
+    rs = np.where(al != 0.0, ag / np.where(al == 0.0, 1.0, al), 100.0)
+    return 100.0 - 100.0 / (1.0 + rs)
 
-    rsis: List[Optional[float]] = [None] * length
-    for i in range(length, len(gains)):
-        avg_g = (avg_g * (length - 1) + gains[i]) / length
-        avg_l = (avg_l * (length - 1) + losses[i]) / length
-        rs = (avg_g / avg_l) if avg_l != 0 else 100.0
-        rsis.append(100.0 - (100.0 / (1.0 + rs)))
 
-    head: List[Optional[float]] = [None]
-    return head + rsis
+def rsi(closes: List[float], length: int = 14) -> np.ndarray:
+    """Relative Strength Index (Wilder).
+
+    Returns an array the same length as ``closes`` with ``NaN`` until enough points.
+    """
+    out = np.full(len(closes), np.nan)
+    if len(closes) >= length + 2:
+        out[length + 1 :] = _rsi_np(as_f64(closes), length)
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _macd_last(closes: np.ndarray, fast: int, slow: int, signal_len: int) -> Tuple[float, float]:
+    """Stream fast/slow/signal EMAs together; return the last (macd_line, signal)."""
+    kf = 2.0 / (fast + 1)
+    ks = 2.0 / (slow + 1)
+    ksig = 2.0 / (signal_len + 1)
+    ef = closes[0]
+    es = closes[0]
+    esig = 0.0
+    for i in range(1, closes.shape[0]):
+        x = closes[i]
+        ef = ef + kf * (x - ef)
+        es = es + ks * (x - es)
+        esig = esig + ksig * ((ef - es) - esig)
+    return ef - es, esig
 
 
 def macd(
@@ -55,12 +143,16 @@ def macd(
     signal_len: int = 9,
 ) -> Tuple[float, float, float]:
     """MACD triple: (macd_line, signal, histogram) using EMA(fast/slow/signal)."""
-    ef = ema(closes, fast)
-    es = ema(closes, slow)
-    # Align series to the length of the slow EMA
-    macd_line = [f - s for f, s in zip(ef[-len(es) :], es)]
-    sig = ema(macd_line, signal_len)
-    return macd_line[-1], sig[-1], macd_line[-1] - sig[-1]
+    if len(closes) == 0:
+        raise IndexError("macd requires at least one close")
+    line, sig = _macd_last(as_f64(closes), fast, slow, signal_len)
+    return float(line), float(sig), float(line - sig)
+
+
+def _cum_vwap(h: np.ndarray, lo: np.ndarray, c: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Cumulative typical-price VWAP over equally sized float64 arrays."""
+    tp = (h + lo + c) / 3.0
+    return np.cumsum(tp * v) / np.maximum(np.cumsum(v), 1e-9)
 
 
 def vwap(
@@ -73,15 +165,12 @@ def vwap(
 
     Returns a list the same length as the inputs.
     """
-    out: List[float] = []
-    cum_pv = 0.0
-    cum_v = 0.0
-    for h, lo, c, v in zip(highs, lows, closes, volumes):
-        tp = (float(h) + float(lo) + float(c)) / 3.0
-        cum_pv += tp * float(v)
-        cum_v += float(v)
-        out.append(cum_pv / max(cum_v, 1e-9))
-    return out
+    m = min(len(highs), len(lows), len(closes), len(volumes))
+    if m == 0:
+        return []
+    return _cum_vwap(
+        as_f64(highs, m), as_f64(lows, m), as_f64(closes, m), as_f64(volumes, m)
+    ).tolist()
 
 
 def anchored_vwap(
@@ -90,27 +179,22 @@ def anchored_vwap(
     closes: List[float],
     volumes: List[float],
     start_idx: int,
-) -> List[Optional[float]]:
+) -> np.ndarray:
     """Anchored VWAP from ``start_idx`` (inclusive).
 
-    Returns list aligned to inputs with ``None`` before ``start_idx``.
+    Returns an array aligned to inputs with ``NaN`` before ``start_idx``.
     """
     n = len(closes)
-    if n == 0:
-        return []
+    out = np.full(n, np.nan)
     start = max(0, int(start_idx))
-    out: List[Optional[float]] = [None] * min(start, n)
-    cum_pv = 0.0
-    cum_v = 0.0
-    for i in range(start, n):
-        tp = (float(highs[i]) + float(lows[i]) + float(closes[i])) / 3.0
-        cum_pv += tp * float(volumes[i])
-        cum_v += float(volumes[i])
-        out.append(cum_pv / max(cum_v, 1e-9))
-    # If start > n, pad to n with None to keep alignment
-    if len(out) < n:
-        return out
-    return out[:n]
+    if start < n:
+        out[start:] = _cum_vwap(
+            as_f64(highs, n)[start:],
+            as_f64(lows, n)[start:],
+            as_f64(closes, n)[start:],
+            as_f64(volumes, n)[start:],
+        )
+    return out
 
 
 # =====================
@@ -118,19 +202,45 @@ def anchored_vwap(
 # =====================
 
 
-def sma(values: List[Number], length: int) -> List[Optional[float]]:
+def sma(values: List[Number], length: int) -> np.ndarray:
     """Simple moving average.
 
-    Returns a list the same length as ``values``, with ``None`` until enough points.
+    Returns an array the same length as ``values``, with ``NaN`` until enough points.
     """
     n = int(max(1, length))
-    out: List[Optional[float]] = []
-    s = 0.0
-    for i, v in enumerate(values):
-        s += float(v)
-        if i >= n:
-            s -= float(values[i - n])
-        out.append(None if i < n - 1 else s / n)
+    m = len(values)
+    out = np.full(m, np.nan)
+    if m >= n:
+        c = np.concatenate(([0.0], np.cumsum(as_f64(values))))
+        out[n - 1 :] = (c[n:] - c[:-n]) / n
+    return out
+
+
+def _true_range(h: np.ndarray, lo: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """True range aligned to inputs (``tr[0] == 0``)."""
+    tr = np.zeros_like(h)
+    pc = c[:-1]
+    tr[1:] = np.maximum(h[1:] - lo[1:], np.maximum(np.abs(h[1:] - pc), np.abs(lo[1:] - pc)))
+    return tr
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _atr_loop(h: np.ndarray, lo: np.ndarray, c: np.ndarray, n: int) -> np.ndarray:
+    """Wilder ATR for bars ``n ..`` in one pass (caller guarantees ``len > n``)."""
+    m = h.shape[0]
+    out = np.empty(m - n)
+    atr_prev = 0.0
+    for i in range(1, m):
+        pc = c[i - 1]
+        tr = max(h[i] - lo[i], abs(h[i] - pc), abs(lo[i] - pc))
+        if i < n:
+            atr_prev += tr
+        elif i == n:
+            atr_prev = (atr_prev + tr) / n
+            out[0] = atr_prev
+        else:
+            atr_prev = (atr_prev * (n - 1) + tr) / n
+            out[i - n] = atr_prev
     return out
 
 
@@ -139,138 +249,153 @@ def atr(
     lows: List[Number],
     closes: List[Number],
     length: int = 14,
-) -> List[Optional[float]]:
+) -> np.ndarray:
     """Average True Range (Wilder).
 
-    Returns a list with ``None`` for the first ``length-1`` elements (Wilder smoothing).
+    Returns an array with ``NaN`` for the first ``length`` elements (Wilder smoothing).
     """
     n = int(max(1, length))
     m = min(len(highs), len(lows), len(closes))
-    if m == 0:
-        return []
-
-    tr: List[float] = [0.0] * m
-    prev_close = float(closes[0])
-    for i in range(1, m):
-        h = float(highs[i])
-        lo = float(lows[i])
-        pc = float(prev_close)
-        tr[i] = max(h - lo, abs(h - pc), abs(lo - pc))
-        prev_close = float(closes[i])
-
-    out: List[Optional[float]] = [None] * m
+    out = np.full(m, np.nan)
     if m <= n:
         return out
 
-    # initial ATR = average of first n TR values starting at index 1
-    init = sum(tr[1 : n + 1]) / n
-    out[n] = init
-    atr_prev = init
-    for i in range(n + 1, m):
-        atr_prev = (atr_prev * (n - 1) + tr[i]) / n
-        out[i] = atr_prev
+    h = as_f64(highs, m)
+    lo = as_f64(lows, m)
+    c = as_f64(closes, m)
+    if HAS_NUMBA:
+        vals = _atr_loop(h, lo, c, n)
+    else:
+        # initial ATR = average of first n TR values starting at index 1
+        tr = _true_range(h, lo, c)
+        init = float(tr[1 : n + 1].sum()) / n
+        vals = np.concatenate(([init], wilder(tr[n + 1 :], init, n)))
+    out[n:] = vals
     return out
 
 
+@njit(cache=True, fastmath=True, nogil=True)
+def _adx_kernel(
+    h: np.ndarray, lo: np.ndarray, c: np.ndarray, n: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Single-pass ADX: DM/TR, Wilder smoothing, DX and ADX seeding/smoothing fused.
+
+    Returns ``(adx, ok)`` where ``ok[i]`` marks bars with a defined ADX.
+    """
+    m = h.shape[0]
+    out = np.zeros(m)
+    ok = np.zeros(m, dtype=np.bool_)
+    ring = np.empty(n)  # last n DX values, used once to seed ADX
+    tr_s = 0.0
+    pdm_s = 0.0
+    mdm_s = 0.0
+    adx_prev = 0.0
+    consec = 0
+    seeded = False
+    for i in range(1, m):
+        up_move = h[i] - h[i - 1]
+        down_move = lo[i - 1] - lo[i]
+        pdm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        mdm = down_move if (down_move > up_move and down_move > 0) else 0.0
+        pc = c[i - 1]
+        tr = max(h[i] - lo[i], abs(h[i] - pc), abs(lo[i] - pc))
+        if i <= n:
+            tr_s += tr
+            pdm_s += pdm
+            mdm_s += mdm
+            if i < n:
+                continue
+        else:
+            tr_s = tr_s - (tr_s / n) + tr
+            pdm_s = pdm_s - (pdm_s / n) + pdm
+            mdm_s = mdm_s - (mdm_s / n) + mdm
+        valid = tr_s != 0.0
+        dx = 0.0
+        if valid:
+            p = 100.0 * pdm_s / tr_s
+            q = 100.0 * mdm_s / tr_s
+            denom = p + q
+            valid = denom != 0.0
+            if valid:
+                dx = 100.0 * abs((p - q) / denom)
+        if seeded:
+            if valid:
+                adx_prev = (adx_prev * (n - 1) + dx) / n
+                out[i] = adx_prev
+                ok[i] = True
+        elif valid:
+            ring[consec] = dx
+            consec += 1
+            if consec == n:
+                adx_prev = ring.sum() / n
+                out[i] = adx_prev
+                ok[i] = True
+                seeded = True
+        else:
+            consec = 0
+    return out, ok
+
+
+def _adx_np(h: np.ndarray, lo: np.ndarray, c: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized ``_adx_kernel`` (same contract) for when numba is unavailable."""
+    m = h.shape[0]
+    out = np.zeros(m)
+    ok = np.zeros(m, dtype=bool)
+    if m <= n:
+        return out, ok
+    up = np.diff(h)
+    down = -np.diff(lo)
+    pdm = np.where((up > down) & (up > 0), up, 0.0)
+    mdm = np.where((down > up) & (down > 0), down, 0.0)
+    tr = _true_range(h, lo, c)[1:]
+
+    def _smooth(x: np.ndarray) -> np.ndarray:
+        # Wilder running sum scaled by 1/n (the ratios below are unaffected)
+        seed = float(x[:n].mean())
+        return np.concatenate(([seed], wilder(x[n:], seed, n)))
+
+    tr_s, pdm_s, mdm_s = _smooth(tr), _smooth(pdm), _smooth(mdm)
+    safe_tr = np.where(tr_s != 0.0, tr_s, 1.0)
+    p = 100.0 * pdm_s / safe_tr
+    q = 100.0 * mdm_s / safe_tr
+    denom = p + q
+    valid = (tr_s != 0.0) & (denom != 0.0)
+    dx = np.where(valid, 100.0 * np.abs((p - q) / np.where(denom != 0.0, denom, 1.0)), 0.0)
+    # Seed at the first run of n consecutive valid DX values
+    idx = np.arange(dx.shape[0])
+    run = idx - np.maximum.accumulate(np.where(valid, -1, idx))
+    hits = np.flatnonzero(run >= n)
+    if hits.size == 0:
+        return out, ok
+    s = int(hits[0])
+    seed = float(dx[s - n + 1 : s + 1].mean())
+    rest = s + 1 + np.flatnonzero(valid[s + 1 :])
+    adx_v = np.concatenate(([seed], wilder(dx[rest], seed, n)))
+    pos = n + np.concatenate(([s], rest))
+    out[pos] = adx_v
+    ok[pos] = True
+    return out, ok
+
+
 def adx(
     highs: List[Number],
     lows: List[Number],
     closes: List[Number],
     length: int = 14,
-) -> List[Optional[float]]:
+) -> np.ndarray:
     """Average Directional Index (Wilder).
 
-    Returns a list aligned to inputs, with ``None`` until enough points for smoothing.
+    Returns an array aligned to inputs, with ``NaN`` where ADX is undefined.
     """
     n = int(max(1, length))
     m = min(len(highs), len(lows), len(closes))
     if m == 0:
-        return []
-
-    plus_dm = [0.0] * m
-    minus_dm = [0.0] * m
-    tr = [0.0] * m
-
-    for i in range(1, m):
-        up_move = float(highs[i]) - float(highs[i - 1])
-        down_move = float(lows[i - 1]) - float(lows[i])
-        plus_dm[i] = up_move if (up_move > down_move and up_move > 0) else 0.0
-        minus_dm[i] = down_move if (down_move > up_move and down_move > 0) else 0.0
-        h = float(highs[i])
-        lo = float(lows[i])
-        pc = float(closes[i - 1])
-        tr[i] = max(h - lo, abs(h - pc), abs(lo - pc))
-
-    def wilder_smooth(arr: List[float]) -> List[Optional[float]]:
-        out_s: List[Optional[float]] = [None] * m
-        if m <= n:
-            return out_s
-        init_s = sum(arr[1 : n + 1])
-        out_s[n] = init_s
-        prev_s = init_s
-        for i in range(n + 1, m):
-            prev_s = prev_s - (prev_s / n) + arr[i]
-            out_s[i] = prev_s
-        return out_s
-
-    tr_s = wilder_smooth(tr)
-    pdm_s = wilder_smooth(plus_dm)
-    mdm_s = wilder_smooth(minus_dm)
-
-    plus_di: List[Optional[float]] = [None] * m
-    minus_di: List[Optional[float]] = [None] * m
-    for i in range(m):
-        tsi = tr_s[i]
-        if tsi is None or tsi == 0.0:
-            plus_di[i] = None
-            minus_di[i] = None
-        else:
-            pval = pdm_s[i]
-            mval = mdm_s[i]
-            plus_di[i] = (100.0 * pval / tsi) if pval is not None else None
-            minus_di[i] = (100.0 * mval / tsi) if mval is not None else None
-
-    dx: List[Optional[float]] = [None] * m
-    for i in range(m):
-        p = plus_di[i]
-        m_ = minus_di[i]
-        if p is not None and m_ is not None:
-            denom = p + m_
-            dx[i] = None if denom == 0.0 else 100.0 * abs((p - m_) / denom)
-        else:
-            dx[i] = None
-
-    adx_out: List[Optional[float]] = [None] * m
-
-    valid_dx: List[float] = [d for d in dx if d is not None]
-    if len(valid_dx) < n:
-        return adx_out
+        return np.empty(0)
 
-    start = 0
-    consec = 0
-    for i in range(m):
-        if dx[i] is not None:
-            consec += 1
-            if consec == n:
-                start = i
-                break
-        else:
-            consec = 0
-    if consec < n:
-        return adx_out
-
-    window: List[float] = [d for d in dx[start - n + 1 : start + 1] if d is not None]
-    init_adx = sum(window) / n
-    adx_out[start] = init_adx
-    prev = init_adx
-    for i in range(start + 1, m):
-        dxi = dx[i]
-        if dxi is None:
-            adx_out[i] = None
-        else:
-            prev = (prev * (n - 1) + dxi) / n
-            adx_out[i] = prev
-    return adx_out
+    kernel = _adx_kernel if HAS_NUMBA else _adx_np
+    out, ok = kernel(as_f64(highs, m), as_f64(lows, m), as_f64(closes, m), n)
+    out[~ok] = np.nan
+    return out
 
 
 # =====================
@@ -278,16 +403,19 @@ def adx(
 # =====================
 
 
+def _rsi_tail(closes: List[float], length: int) -> np.ndarray:
+    """RSI values from bar ``length + 1`` on (empty if there are too few closes)."""
+    if len(closes) < length + 2:
+        return np.empty(0)
+    return _rsi_np(as_f64(closes), length)
+
+
 def rsi_compact(closes: List[float], length: int = 14) -> List[float]:
     """Return RSI series with None values removed (tail-aligned list)."""
-    base = rsi(closes, length)
-    return [float(v) for v in base if isinstance(v, (int, float))]
+    return _rsi_tail(closes, length).tolist()
 
 
 def rsi_last(closes: List[float], length: int = 14) -> Optional[float]:
     """Return the latest available RSI value (or None if insufficient data)."""
-    base = rsi(closes, length)
-    for v in reversed(base):
-        if isinstance(v, (int, float)):
-            return float(v)
-    return None
+    tail = _rsi_tail(closes, length)
+    return float(tail[-1]) if tail.size else None
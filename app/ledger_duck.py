@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import json
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
 
 try:
     import duckdb
 except Exception:
     duckdb = None  # lazy-fail
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
 
 @dataclass
 class TradeOpen:
@@ -31,14 +38,68 @@ class TradeClose:
     meta: Dict[str, Any]
 
 
+# Schema DDL runs once per ledger path per process.
+_SCHEMA_READY: set[str] = set()
+
+_SQL_OPEN = "INSERT OR REPLACE INTO trades_open VALUES (?,?,?,?,?,?,?,?);"
+_SQL_CLOSE = "INSERT INTO trades_closed VALUES (?,?,?,?,?,?);"
+_SQL_DEL_OPEN = "DELETE FROM trades_open WHERE trade_id = ?;"
+
+
 def _con(db_path: str):
     if duckdb is None:
         raise RuntimeError("duckdb not installed")
     return duckdb.connect(db_path)
 
 
-def ensure_schema(db_path: str):
+@contextmanager
+def _session(db_path: str):
+    """One connection per call/batch: DuckDB holds the file lock while a connection is open."""
     con = _con(db_path)
+    try:
+        yield con
+    finally:
+        con.close()
+
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def _dumps(meta: Dict[str, Any]) -> str:
+        try:
+            return orjson.dumps(meta or {}, default=str, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            # e.g. non-contiguous ndarrays / exotic keys: fall back to the stdlib encoder
+            return json.dumps(meta or {}, default=str)
+
+else:
+
+    def _dumps(meta: Dict[str, Any]) -> str:
+        return json.dumps(meta or {}, default=str)
+
+
+def _open_params(row: TradeOpen) -> list:
+    return [
+        row.trade_id,
+        row.ts_ms,
+        row.symbol,
+        row.side,
+        row.entry,
+        row.sl,
+        row.size_usd,
+        _dumps(row.meta),
+    ]
+
+
+def ensure_schema(db_path: str):
+    if db_path in _SCHEMA_READY:
+        return
+    with _session(db_path) as con:
+        _create_tables(con)
+    _SCHEMA_READY.add(db_path)
+
+
+def _create_tables(con) -> None:
     con.execute(
         """
     CREATE TABLE IF NOT EXISTS trades_open(
@@ -65,24 +126,26 @@ def ensure_schema(db_path: str):
     );
     """
     )
-    con.close()
 
 
 def append_open(db_path: str, row: TradeOpen):
-    con = _con(db_path)
-    con.execute(
-        "INSERT OR REPLACE INTO trades_open VALUES (?,?,?,?,?,?,?,?);",
-        [row.trade_id, row.ts_ms, row.symbol, row.side, row.entry, row.sl, row.size_usd, row.meta],
-    )
-    con.close()
+    with _session(db_path) as con:
+        con.execute(_SQL_OPEN, _open_params(row))
+
+
+def append_open_many(db_path: str, rows: Iterable[TradeOpen]):
+    """Insert/replace several open trades in one batched statement."""
+    params = [_open_params(r) for r in rows]
+    if params:
+        with _session(db_path) as con:
+            con.executemany(_SQL_OPEN, params)
 
 
 def append_close(db_path: str, row: TradeClose):
-    con = _con(db_path)
-    con.execute(
-        "INSERT INTO trades_closed VALUES (?,?,?,?,?,?);",
-        [row.trade_id, row.ts_ms, row.exit, row.pnl_usd, row.reason, row.meta],
-    )
-    # remove from open if exists
-    con.execute("DELETE FROM trades_open WHERE trade_id = ?;", [row.trade_id])
-    con.close()
+    with _session(db_path) as con:
+        con.execute(
+            _SQL_CLOSE,
+            [row.trade_id, row.ts_ms, row.exit, row.pnl_usd, row.reason, _dumps(row.meta)],
+        )
+        # remove from open if exists
+        con.execute(_SQL_DEL_OPEN, [row.trade_id])
@@ -1,27 +1,107 @@
 #!/usr/bin/env python3
 import argparse
 import gzip
+import mmap
 import os
+import re
 import shutil
 import sqlite3
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
+PURGE_BATCH_ROWS = 10_000
+VACUUM_PAGES = 1000
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
-def purge_sqlite(db_path: str, table: str, ts_column: str, keep_days: int):
-    conn = sqlite3.connect(db_path)
+
+def _ensure_incremental_vacuum(cur: sqlite3.Cursor) -> bool:
+    """Switch the DB to auto_vacuum=INCREMENTAL. Returns True if a one-time VACUUM ran."""
+    cur.execute("PRAGMA auto_vacuum")
+    row = cur.fetchone()
+    if row and int(row[0]) == 2:
+        return False
+    # Changing auto_vacuum on an existing DB only takes effect after a full VACUUM (once).
+    print("[DB] Enabling incremental auto_vacuum (one-time VACUUM) ...")
+    cur.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cur.execute("VACUUM")
+    return True
+
+
+def _ident(name: str) -> str:
+    """Validate a SQL identifier before it is interpolated into a statement."""
+    if not _IDENT_RE.fullmatch(name or ""):
+        raise ValueError(f"invalid SQL identifier: {name!r}")
+    return name
+
+
+def _ts_is_epoch(cur: sqlite3.Cursor, table: str, ts_column: str) -> bool:
+    """True if ``ts_column`` holds numbers (epoch ms), judged by its declared type or data."""
+    cur.execute(f'PRAGMA table_info("{table}")')
+    decl = next((str(r[2] or "").upper() for r in cur.fetchall() if r[1] == ts_column), "")
+    if any(t in decl for t in ("INT", "REAL", "NUM", "FLOA", "DOUB")):
+        return True
+    if "CHAR" in decl or "TEXT" in decl or "CLOB" in decl:
+        return False
+    cur.execute(
+        f'SELECT typeof("{ts_column}") FROM "{table}" WHERE "{ts_column}" IS NOT NULL LIMIT 1'
+    )
+    row = cur.fetchone()
+    return bool(row) and row[0] in ("integer", "real")
+
+
+def purge_sqlite(
+    db_path: str,
+    table: str,
+    ts_column: str,
+    keep_days: int,
+    ts_is_epoch: Optional[bool] = None,
+):
+    """Delete rows older than ``keep_days``; ``ts_is_epoch=None`` detects the column type."""
+    table = _ident(table)
+    ts_column = _ident(ts_column)
+    # Autocommit mode: batches are wrapped in explicit BEGIN IMMEDIATE ... COMMIT below
+    conn = sqlite3.connect(db_path, isolation_level=None)
     try:
         cur = conn.cursor()
-        # Normalize table/column names via quoting
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
         cutoff_ts = datetime.utcnow() - timedelta(days=keep_days)
-        # If your ts column is stored as ISO text, this works; if epoch, switch to integer compare.
         cutoff_iso = cutoff_ts.strftime("%Y-%m-%d %H:%M:%S")
+        if ts_is_epoch is None:
+            ts_is_epoch = _ts_is_epoch(cur, table, ts_column)
+        # Epoch-ms columns compare as integers; ISO text columns fall back to string compare
+        cutoff: int | str = (
+            int(cutoff_ts.replace(tzinfo=timezone.utc).timestamp() * 1000)
+            if ts_is_epoch
+            else cutoff_iso
+        )
+        # Range deletes need an index on the ts column, otherwise every batch is a full scan
+        cur.execute(
+            f'CREATE INDEX IF NOT EXISTS "idx_{table}_{ts_column}" ON "{table}"("{ts_column}")'
+        )
+        delete_sql = (
+            f'DELETE FROM "{table}" WHERE rowid IN '
+            f'(SELECT rowid FROM "{table}" WHERE "{ts_column}" < ? LIMIT {PURGE_BATCH_ROWS})'
+        )
         print(f"[DB] Purging rows in {table} older than {cutoff_iso} (UTC) ...")
-        cur.execute(f'DELETE FROM "{table}" WHERE "{ts_column}" < ?', (cutoff_iso,))
-        print(f"[DB] Rows deleted: {cur.rowcount}")
-        conn.commit()
-        print("[DB] Running VACUUM to reclaim space ...")
-        cur.execute("VACUUM")
-        conn.commit()
+        deleted = 0
+        while True:
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.execute(delete_sql, (cutoff,))
+                batch = max(0, cur.rowcount)
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            deleted += batch
+            if batch < PURGE_BATCH_ROWS:
+                break
+        print(f"[DB] Rows deleted: {deleted}")
+        if not _ensure_incremental_vacuum(cur):
+            print(f"[DB] Reclaiming up to {VACUUM_PAGES} free pages (incremental_vacuum) ...")
+            cur.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})")
+            cur.fetchall()
         print("[DB] Done.")
     finally:
         conn.close()
@@ -32,43 +112,33 @@ def rotate_csv(csv_path: str, keep_lines: int):
         print(f"[CSV] {csv_path} not found; skipping.")
         return
 
-    # Count lines
-    with open(csv_path, "r", encoding="utf-8", errors="ignore") as f:
-        total = sum(1 for _ in f)
-    print(f"[CSV] {csv_path}: {total} lines. Keep last {keep_lines}.")
-
-    if total <= keep_lines:
-        print("[CSV] No rotation needed.")
-        return
-
-    # Create a temp with only the tail
+    # Locate the start of the last keep_lines lines by scanning newlines backwards (no full read)
     tmp_tail = csv_path + ".tail"
-    # Efficient tail-read
     with open(csv_path, "rb") as f:
-        f.seek(0, os.SEEK_END)
-        end = f.tell()
-        # Read chunks from end until enough newlines are found
-        chunk = 64 * 1024
-        data = bytearray()
-        newlines = 0
-        pos = end
-        while pos > 0 and newlines <= keep_lines:
-            read_size = chunk if pos - chunk > 0 else pos
-            pos -= read_size
-            f.seek(pos)
-            block = f.read(read_size)
-            data[:0] = block
-            newlines = data.count(b"\n")
-        # Keep only last keep_lines lines
-        lines = data.splitlines()[-keep_lines:]
-    with open(tmp_tail, "wb") as out:
-        out.write(b"\n".join(lines) + b"\n")
+        if os.fstat(f.fileno()).st_size == 0:
+            print("[CSV] No rotation needed.")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            pos = end - 1 if mm[end - 1 : end] == b"\n" else end
+            for _ in range(max(0, keep_lines)):
+                pos = mm.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    break
+            if pos < 0:
+                print(f"[CSV] {csv_path}: <= {keep_lines} lines. No rotation needed.")
+                return
+            print(f"[CSV] {csv_path}: keeping last {keep_lines} lines.")
+            with open(tmp_tail, "wb") as out:
+                out.write(mm[pos + 1 :])
+                if mm[end - 1 : end] != b"\n":
+                    out.write(b"\n")
 
     # Archive the original
     stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     gz_path = f"{os.path.splitext(csv_path)[0]}_{stamp}.csv.gz"
-    with open(csv_path, "rb") as f_in, gzip.open(gz_path, "wb") as f_out:
-        shutil.copyfileobj(f_in, f_out)
+    with open(csv_path, "rb") as f_in, gzip.open(gz_path, "wb", compresslevel=1) as f_out:
+        shutil.copyfileobj(f_in, f_out, length=1 << 20)
     print(f"[CSV] Archived old file to {gz_path}")
 
     # Replace original with tail
@@ -80,13 +150,19 @@ def main():
     ap = argparse.ArgumentParser(description="Purge SQLite telemetry and rotate CSV.")
     ap.add_argument("--db", required=True, help="Path to SQLite DB (e.g., taser.db)")
     ap.add_argument("--table", default="telemetry", help="Telemetry table name")
-    ap.add_argument("--ts-column", default="ts", help="Timestamp column (ISO text)")
+    ap.add_argument("--ts-column", default="ts", help="Timestamp column")
+    ap.add_argument(
+        "--ts-is-epoch",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Timestamp column holds epoch milliseconds (default: detect from the column type)",
+    )
     ap.add_argument("--keep-days", type=int, default=7, help="Days to retain")
     ap.add_argument("--csv", help="Path to telemetry CSV to rotate")
     ap.add_argument("--keep-lines", type=int, default=150000, help="Lines to retain in CSV")
     args = ap.parse_args()
 
-    purge_sqlite(args.db, args.table, args.ts_column, args.keep_days)
+    purge_sqlite(args.db, args.table, args.ts_column, args.keep_days, args.ts_is_epoch)
     if args.csv:
         rotate_csv(args.csv, args.keep_lines)
 
@@ -1,9 +1,18 @@
 # app/managers/trendscalp_fsm.py — TrendScalp FSM orchestrator (proposals only, no side-effects)
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import time as _now
 from typing import Any, List, Optional
 
+import numpy as np
+
+try:
+    from fastnumbers import try_float as _try_float
+except Exception:  # pragma: no cover - optional dependency
+    _try_float = None
+
 from .. import config as C
 from ..components.guards import be_floor, guard_min_gap
 from ..components.locks import abs_lock_from_entry, to_tp_lock, trail_fracR
@@ -13,45 +22,70 @@ from ..ml.ml_assist import score_tp1_probability
 # --- Entry snapshot helpers (used by the fill path to persist reasons-for-entry) ---
 
 
+_NO_FEATS: dict = {}
+
+
+if _try_float is not None:
+
+    def _to_float(x: Any, default: float | None) -> float | None:
+        """``float(x)``, or ``default`` if ``x`` is None / not numeric (no exceptions)."""
+        return _try_float(x, on_fail=default, on_type_error=default)
+
+else:
+
+    def _to_float(x: Any, default: float | None) -> float | None:
+        """``float(x)``, or ``default`` if ``x`` is None / not numeric."""
+        if x is None:
+            return default
+        try:
+            return float(x)
+        except Exception:
+            return default
+
+
+def _to_float_or(x: Any, default: float) -> float:
+    """``_to_float`` with a non-None default, typed as a plain ``float``."""
+    v = _to_float(x, default)
+    return default if v is None else v
+
+
 def _pick_adx(d: dict) -> float:
-    try:
-        for k in ("adx14", "adx", "di_adx_14"):
-            v = (d or {}).get(k)
-            if v is not None:
-                return float(v)
-    except Exception:
-        pass
-    return 0.0
+    d = d if isinstance(d, dict) else _NO_FEATS
+    v = d.get("adx14")
+    if v is None:
+        v = d.get("adx")
+        if v is None:
+            v = d.get("di_adx_14")
+    return _to_float_or(v, 0.0)
 
 
 def _pick_atr_px(d: dict) -> float:
-    try:
-        for k in ("atr5", "atr14", "atr"):
-            v = (d or {}).get(k)
-            if v is not None:
-                return float(v)
-    except Exception:
-        pass
-    return 0.0
+    d = d if isinstance(d, dict) else _NO_FEATS
+    v = d.get("atr5")
+    if v is None:
+        v = d.get("atr14")
+        if v is None:
+            v = d.get("atr")
+    return _to_float_or(v, 0.0)
 
 
 def _pick_ema200(d: dict) -> float | None:
-    try:
-        for k in ("ema200", "ema200_5m", "ema_200"):
-            v = (d or {}).get(k)
-            if v is not None:
-                return float(v)
-    except Exception:
-        pass
-    return None
+    d = d if isinstance(d, dict) else _NO_FEATS
+    v = d.get("ema200")
+    if v is None:
+        v = d.get("ema200_5m")
+        if v is None:
+            v = d.get("ema_200")
+    return _to_float(v, None)
 
 
 def _structure_flag(side_long: bool, d: dict) -> str:
     """Return 'ok' | 'fail' | 'na' from optional structure flags provided by indicators."""
     key = "structure_ok_long" if side_long else "structure_ok_short"
+    d = d or _NO_FEATS
     try:
-        if key in (d or {}):
-            return "ok" if bool((d or {}).get(key)) else "fail"
+        if key in d:
+            return "ok" if bool(d[key]) else "fail"
     except Exception:
         pass
     return "na"
@@ -78,18 +112,18 @@ def build_entry_validity_snapshot(ctx: Context, feats_5m: dict[str, Any]) -> dic
         "atrpct_e": float(atrpct_e),
         "ema200_side_e": ema_side,
         "structure_e": structure_e,
-        "ts_e": float((ctx.meta or {}).get("ts", 0.0)) or float(__import__("time").time()),
+        "ts_e": float((ctx.meta or {}).get("ts", 0.0)) or _now(),
     }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Proposal:
     sl: Optional[float]
     tps: List[float]
     why: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Context:
     price: float
     side: str  # "LONG" | "SHORT"
@@ -98,10 +132,10 @@ class Context:
     tps: List[float]
     tf1m: dict[str, Any]
     meta: dict[str, Any]
+    is_long: bool = field(init=False)
 
-    @property
-    def is_long(self) -> bool:
-        return self.side.upper() == "LONG"
+    def __post_init__(self) -> None:
+        self.is_long = self.side.upper() == "LONG"
 
 
 # --- helpers for adaptive TP logic ---
@@ -135,42 +169,143 @@ def _detect_regime(price: float, atr5: float, adx14: float | None) -> str:
     """Return 'chop' or 'rally' from ATR% and ADX thresholds."""
     try:
         atr_pct = (atr5 / max(1e-9, price)) if atr5 else 0.0
-        chop_atr_max = float(getattr(C, "MODE_CHOP_ATR_PCT_MAX", 0.0025))
-        chop_adx_max = float(getattr(C, "MODE_CHOP_ADX_MAX", 25.0))
-        if (atr_pct <= chop_atr_max) and ((adx14 or 0.0) <= chop_adx_max):
+        cfg = _cfg()
+        if (atr_pct <= cfg.chop_atr_pct_max) and ((adx14 or 0.0) <= cfg.chop_adx_max):
             return "chop"
         return "rally"
     except Exception:
         return "chop"
 
 
+# --- config snapshot (read once; per-tick paths must not re-run getattr/float casts) ---
+
+
+@dataclass(frozen=True, slots=True)
+class _FsmCfg:
+    ema_tol_pct: float
+    chand_pre_tp2: tuple[int, float]
+    chand_post_tp2: tuple[int, float]
+    chand_post_tp3: tuple[int, float]
+    freeze_trail: bool
+    post_tp1_delay: int
+    be_eps_atr_mult: float
+    trail_style: str
+    tp_lock_style: str
+    tp1_lock_atr_mult: float
+    tp2_lock_atr_mult: float
+    tp1_lock_fracr: float
+    post_tp1_lock_fracr: float
+    tp2_lock_fracr: float
+    abs_lock_usd: float
+    lock_never_worse_than_be: bool
+    mode_adapt_enabled: bool
+    chop_atr_pct_max: float
+    chop_adx_max: float
+    chop_tp_atr_mults: tuple[float, float, float]
+    rally_tp_atr_mults: tuple[float, float, float]
+
+
+@lru_cache(maxsize=1)
+def _cfg() -> _FsmCfg:
+    """Snapshot FSM knobs from config. Call ``refresh_cfg()`` after changing config at runtime."""
+    return _FsmCfg(
+        ema_tol_pct=float(getattr(C, "EMA_TOL_PCT", 0.0015)),
+        chand_pre_tp2=(
+            int(getattr(C, "CHAND_N_PRE_TP2", 9)),
+            float(getattr(C, "CHAND_K_PRE_TP2", 1.2)),
+        ),
+        chand_post_tp2=(
+            int(getattr(C, "CHAND_N_POST_TP2", 7)),
+            float(getattr(C, "CHAND_K_POST_TP2", 0.8)),
+        ),
+        chand_post_tp3=(
+            int(getattr(C, "CHAND_N_POST_TP3", 5)),
+            float(getattr(C, "CHAND_K_POST_TP3", 0.6)),
+        ),
+        freeze_trail=bool(getattr(C, "GLOBAL_NO_TRAIL_BEFORE_TP1", True))
+        or bool(getattr(C, "TRENDSCALP_PAUSE_ABS_LOCKS", False)),
+        post_tp1_delay=int(getattr(C, "POST_TP1_SL_DELAY_BARS", 3)),
+        be_eps_atr_mult=float(getattr(C, "BE_EPS_ATR_MULT", 0.10)),
+        trail_style=str(getattr(C, "TRAIL_STYLE", "fracR")),
+        tp_lock_style=str(getattr(C, "TP_LOCK_STYLE", "trail_fracR")),
+        tp1_lock_atr_mult=float(getattr(C, "TP1_LOCK_ATR_MULT", 0.25)),
+        tp2_lock_atr_mult=float(getattr(C, "TP2_LOCK_ATR_MULT", 0.35)),
+        tp1_lock_fracr=float(getattr(C, "TP1_LOCK_FRACR", 0.40)),
+        post_tp1_lock_fracr=float(
+            getattr(C, "POST_TP1_LOCK_FRACR", float(getattr(C, "TP1_LOCK_FRACR", 0.65)))
+        ),
+        tp2_lock_fracr=float(getattr(C, "TP2_LOCK_FRACR", 0.75)),
+        abs_lock_usd=float(getattr(C, "SCALP_ABS_LOCK_USD", 0.0)),
+        lock_never_worse_than_be=bool(getattr(C, "LOCK_NEVER_WORSE_THAN_BE", True)),
+        mode_adapt_enabled=bool(getattr(C, "MODE_ADAPT_ENABLED", False)),
+        chop_atr_pct_max=float(getattr(C, "MODE_CHOP_ATR_PCT_MAX", 0.0025)),
+        chop_adx_max=float(getattr(C, "MODE_CHOP_ADX_MAX", 25.0)),
+        chop_tp_atr_mults=_parse_mults(
+            getattr(C, "MODE_CHOP_TP_ATR_MULTS", "0.60,1.00,1.50"), "0.60,1.00,1.50"
+        ),
+        rally_tp_atr_mults=_parse_mults(
+            getattr(C, "MODE_RALLY_TP_ATR_MULTS", "0.90,1.60,2.60"), "0.90,1.60,2.60"
+        ),
+    )
+
+
+def refresh_cfg() -> None:
+    """Drop the cached config snapshot so the next call re-reads ``config``."""
+    _cfg.cache_clear()
+
+
 # --- structure trailing helpers ---
 
 
-def _series(d: dict, key: str) -> list:
+_EMPTY = np.empty(0)
+
+
+def _series(d: dict, key: str, tail: int = 0) -> np.ndarray:
+    """``d[key]`` as a float64 array (``None`` -> ``NaN``); empty if missing or malformed.
+
+    With ``tail > 0`` only the last ``tail`` values are converted.
+    """
+    v = d.get(key) if isinstance(d, dict) else None
+    if not isinstance(v, (list, tuple, np.ndarray)):
+        return _EMPTY
     try:
-        v = d.get(key) if isinstance(d, dict) else None
-        return list(v) if isinstance(v, (list, tuple)) else []
-    except Exception:
-        return []
+        return np.array(v[-tail:] if tail > 0 else v, dtype=np.float64)
+    except (TypeError, ValueError):  # non-numeric / ragged payload
+        return _EMPTY
 
 
-def _highest(vals: list, n: int) -> float | None:
-    if not vals or n <= 0 or len(vals) < n:
+def _highest(vals: np.ndarray, n: int) -> float | None:
+    if n <= 0 or len(vals) < n:
         return None
-    return float(max(vals[-n:]))
+    return float(vals[-n:].max())
 
 
-def _lowest(vals: list, n: int) -> float | None:
-    if not vals or n <= 0 or len(vals) < n:
+def _lowest(vals: np.ndarray, n: int) -> float | None:
+    if n <= 0 or len(vals) < n:
         return None
-    return float(min(vals[-n:]))
+    return float(vals[-n:].min())
 
 
-def _rsi_slope(vals: list, n: int = 3) -> float:
-    if not vals or len(vals) < n:
-        return 0.0
-    return float(vals[-1] - vals[-n])
+@dataclass(slots=True)
+class FeatureCache:
+    """Per-tick memo of ``tf1m`` tail arrays, shared by ``is_hard_invalidation`` and
+    ``propose`` when both run on the same 1m window. Meta-derived values are not cached:
+    the two calls receive different meta dicts."""
+
+    tf1m: dict[str, Any]
+    tails: dict[tuple[str, int], np.ndarray] = field(default_factory=dict)
+
+    def series(self, key: str, tail: int = 0) -> np.ndarray:
+        """``_series(tf1m, key, tail)``, converted once per cache."""
+        arr = self.tails.get((key, tail))
+        if arr is None:
+            arr = self.tails[(key, tail)] = _series(self.tf1m, key, tail)
+        return arr
+
+
+def build_features(tf1m: dict[str, Any]) -> FeatureCache:
+    """Build the per-tick ``FeatureCache`` for one 1m window."""
+    return FeatureCache(tf1m)
 
 
 # --- EMA alignment & structure helpers for PEV / recovery ---
@@ -185,7 +320,7 @@ def _ema_side_ok(
     try:
         if ema is None:
             return True
-        tol = float(tol_pct) if tol_pct is not None else float(getattr(C, "EMA_TOL_PCT", 0.0015))
+        tol = float(tol_pct) if tol_pct is not None else _cfg().ema_tol_pct
         if is_long:
             return (price >= ema) or (abs(price - ema) / max(1e-9, ema) <= tol)
         else:
@@ -194,20 +329,22 @@ def _ema_side_ok(
         return True
 
 
-def _swing_levels(tf1m: dict, n: int) -> tuple[float | None, float | None]:
+def _swing_levels(cache: FeatureCache, n: int) -> tuple[float | None, float | None]:
     """Return recent swing high/low over last n bars from tf1m highs/lows."""
-    highs = _series(tf1m, "high")
-    lows = _series(tf1m, "low")
-    return _highest(highs, n), _lowest(lows, n)
+    return _highest(cache.series("high", n), n), _lowest(cache.series("low", n), n)
 
 
-def is_hard_invalidation(price: float, is_long: bool, meta: dict, tf1m: dict) -> dict:
+def is_hard_invalidation(
+    price: float, is_long: bool, meta: dict, tf1m: dict, cache: FeatureCache | None = None
+) -> dict:
     """Composite hard/soft invalidation assessment used by PEV.
     Hard invalidation requires BOTH:
       1) EMA200 side flip against position (5m OR 15m), and
       2) Structure break of recent swing (n bars) with ATR pad.
     Returns a diagnostic dict with keys: hard, ema_side_ok,
     struct, swing_h, swing_l, pad, ema5, ema15
+
+    ``cache`` (from ``build_features(tf1m)``) lets ``propose`` reuse the swing arrays.
     """
     d: dict[str, Any] = {}
     try:
@@ -215,7 +352,7 @@ def is_hard_invalidation(price: float, is_long: bool, meta: dict, tf1m: dict) ->
         ema15 = (meta or {}).get("ema200_15m")
         ema5 = float(ema5) if ema5 is not None else None
         ema15 = float(ema15) if ema15 is not None else None
-        tol = float(getattr(C, "EMA_TOL_PCT", 0.0015))
+        tol = _cfg().ema_tol_pct
         ema_ok = _ema_side_ok(price, ema5, is_long, tol) and _ema_side_ok(
             price, ema15, is_long, tol
         )
@@ -227,16 +364,14 @@ def is_hard_invalidation(price: float, is_long: bool, meta: dict, tf1m: dict) ->
     try:
         atr5 = float((meta or {}).get("atr5", 0.0))
         # Choose structure window to mirror trailing logic
+        cfg = _cfg()
         if (meta or {}).get("hit_tp3", False):
-            n = int(getattr(C, "CHAND_N_POST_TP3", 5))
-            k = float(getattr(C, "CHAND_K_POST_TP3", 0.6))
+            n, k = cfg.chand_post_tp3
         elif (meta or {}).get("hit_tp2", False):
-            n = int(getattr(C, "CHAND_N_POST_TP2", 7))
-            k = float(getattr(C, "CHAND_K_POST_TP2", 0.8))
+            n, k = cfg.chand_post_tp2
         else:
-            n = int(getattr(C, "CHAND_N_PRE_TP2", 9))
-            k = float(getattr(C, "CHAND_K_PRE_TP2", 1.2))
-        swing_h, swing_l = _swing_levels(tf1m, n)
+            n, k = cfg.chand_pre_tp2
+        swing_h, swing_l = _swing_levels(cache or FeatureCache(tf1m), n)
         pad = k * atr5
         struct_ok = True
         if is_long and swing_l is not None:
@@ -269,260 +404,182 @@ def is_hard_invalidation(price: float, is_long: bool, meta: dict, tf1m: dict) ->
     return d
 
 
-def propose(ctx: Context) -> Proposal:
+def _lock_to_targets(
+    sl: float,
+    ctx: Context,
+    tp1: float | None,
+    tp2: float | None,
+    atr5: float,
+    frac1: float,
+    cfg: _FsmCfg,
+) -> float:
+    """Tighten-only lock toward TP1/TP2 per ``TP_LOCK_STYLE`` (``to_tp1`` or fracR)."""
+    is_long = ctx.is_long
+    if cfg.tp_lock_style == "to_tp1" and tp1:
+        sl = to_tp_lock(sl, is_long, tp1, atr_mult=cfg.tp1_lock_atr_mult, atr=atr5)
+        if tp2:
+            sl = to_tp_lock(sl, is_long, tp2, atr_mult=cfg.tp2_lock_atr_mult, atr=atr5)
+        return sl
+    if tp1:
+        pad1 = cfg.tp1_lock_atr_mult * atr5
+        sl = trail_fracR(sl, is_long, ctx.entry, tp1, frac=frac1, atr_pad=pad1)
+    if tp2:
+        pad2 = cfg.tp2_lock_atr_mult * atr5
+        sl = trail_fracR(sl, is_long, ctx.entry, tp2, frac=cfg.tp2_lock_fracr, atr_pad=pad2)
+    return sl
+
+
+def _tp_list(t1: float | None, t2: float | None, t3: float | None) -> List[float]:
+    """The defined TPs, in ladder order."""
+    out: List[float] = []
+    if t1 is not None:
+        out.append(t1)
+    if t2 is not None:
+        out.append(t2)
+    if t3 is not None:
+        out.append(t3)
+    return out
+
+
+def propose(ctx: Context, cache: FeatureCache | None = None) -> Proposal:
     """Return a tighten-only SL and (optionally) refreshed TPs. No venue/TG side-effects.
 
     - Keeps TASER/common code intact by only proposing values (caller applies via existing helpers).
     - Uses ML assist (p_tp1) safely; neutral fallback if model missing.
     - Honors existing knobs from config/env where applicable.
+    - ``cache`` (from ``build_features(ctx.tf1m)``) reuses arrays from ``is_hard_invalidation``.
     """
     is_long = ctx.is_long
+    entry, price = ctx.entry, ctx.price
+    meta = ctx.meta or _NO_FEATS
+    cfg = _cfg()
 
     # Unpack & normalize TPs
-    tp1, tp2, tp3 = (list(ctx.tps) + [None, None, None])[:3]
+    tps = ctx.tps
+    n_tps = len(tps)
+    tp1 = tps[0] if n_tps > 0 else None
+    tp2 = tps[1] if n_tps > 1 else None
+    tp3 = tps[2] if n_tps > 2 else None
     tp1, tp2, tp3 = ensure_order(tp1, tp2, tp3, is_long)
 
     # ML assist
     p_tp1 = score_tp1_probability(
-        price=ctx.price,
-        entry=ctx.entry,
+        price=price,
+        entry=entry,
         sl=ctx.sl,
         tp1=tp1,
         meta=ctx.meta,
     )
 
     # Context features
-    atr5 = float((ctx.meta or {}).get("atr5", 0.0))
-    adx14 = (ctx.meta or {}).get("adx14")
-    try:
-        adx14 = float(adx14) if adx14 is not None else None
-    except Exception:
-        adx14 = None
+    atr5 = float(meta.get("atr5", 0.0))
+    adx14 = _to_float(meta.get("adx14"), None)
 
-    hit_tp1 = bool((ctx.meta or {}).get("hit_tp1", False))
+    # Base TP ladder (ATR-clamped); every return path below starts from it
+    t1, t2, t3 = clamp_tp1_distance(entry, ctx.sl, tp1, tp2, tp3, is_long, atr5)
+
+    hit_tp1 = bool(meta.get("hit_tp1", False))
 
     # Pre‑TP1 freeze knobs
-    freeze_trail = bool(getattr(C, "GLOBAL_NO_TRAIL_BEFORE_TP1", True)) or bool(
-        getattr(C, "TRENDSCALP_PAUSE_ABS_LOCKS", False)
-    )
+    freeze_trail = cfg.freeze_trail
 
     # Start from current SL
     sl_new = float(ctx.sl)
 
     # ---------- PRE‑TP1 BEHAVIOR: keep TP1 realistic; avoid SL choke ----------
     if (not hit_tp1) and freeze_trail:
-        # Clamp TP1/2/3 to ATR‑seeded ladder so TP1 stays achievable (no widen on restart)
-        t1, t2, t3 = clamp_tp1_distance(ctx.entry, ctx.sl, tp1, tp2, tp3, is_long, atr5)
+        # Clamped ladder keeps TP1 achievable (no widen on restart)
         why = f"preTP1_freeze p_tp1={p_tp1:.2f}"
-        out_tps = [x for x in [t1, t2, t3] if x is not None]
-        return Proposal(sl=round(sl_new, 4), tps=out_tps, why=why)
+        return Proposal(sl=round(sl_new, 4), tps=_tp_list(t1, t2, t3), why=why)
 
     # ---------- POST‑TP1 (or trail allowed) SL management ----------
-    bars_since_tp1 = int((ctx.meta or {}).get("bars_since_tp1", 0))
-    post_tp1_delay = int(getattr(C, "POST_TP1_SL_DELAY_BARS", 3))
+    bars_since_tp1 = int(meta.get("bars_since_tp1", 0))
+    post_tp1_delay = cfg.post_tp1_delay
 
     # 0) Optional shallow lock immediately after TP1 (BE + eps)
     if hit_tp1 and bars_since_tp1 == 0:
-        eps = float(getattr(C, "BE_EPS_ATR_MULT", 0.10)) * atr5
-        sl_new = be_floor(sl_new, is_long, ctx.entry)
+        eps = cfg.be_eps_atr_mult * atr5
+        sl_new = be_floor(sl_new, is_long, entry)
         if is_long:
-            sl_new = max(sl_new, ctx.entry + eps)
+            sl_new = max(sl_new, entry + eps)
         else:
-            sl_new = min(sl_new, ctx.entry - eps)
+            sl_new = min(sl_new, entry - eps)
 
     # A) Grace window: do not tighten further for first N bars after TP1
     if hit_tp1 and bars_since_tp1 < post_tp1_delay:
         # Keep TPs maintained but do not move SL more
-        t1, t2, t3 = clamp_tp1_distance(ctx.entry, ctx.sl, tp1, tp2, tp3, is_long, atr5)
         why = f"postTP1_grace={bars_since_tp1}/{post_tp1_delay} p_tp1={p_tp1:.2f}"
-        out_tps = [x for x in [t1, t2, t3] if x is not None]
-        return Proposal(sl=round(sl_new, 4), tps=out_tps, why=why)
+        return Proposal(sl=round(sl_new, 4), tps=_tp_list(t1, t2, t3), why=why)
 
     # B) Trailing after grace
-    trail_style = str(getattr(C, "TRAIL_STYLE", "fracR"))
+    trail_style = cfg.trail_style
+    mode = cfg.tp_lock_style
     if trail_style == "structure":
-        highs = _series(ctx.tf1m, "high")
-        lows = _series(ctx.tf1m, "low")
         # Choose structure window & pad by phase
-        if (ctx.meta or {}).get("hit_tp2", False):
-            n = int(getattr(C, "CHAND_N_POST_TP2", 7))
-            k = float(getattr(C, "CHAND_K_POST_TP2", 0.8))
+        if meta.get("hit_tp2", False):
+            n, k = cfg.chand_post_tp2
         else:
-            n = int(getattr(C, "CHAND_N_PRE_TP2", 9))
-            k = float(getattr(C, "CHAND_K_PRE_TP2", 1.2))
-        if (ctx.meta or {}).get("hit_tp3", False):
-            n = int(getattr(C, "CHAND_N_POST_TP3", 5))
-            k = float(getattr(C, "CHAND_K_POST_TP3", 0.6))
+            n, k = cfg.chand_pre_tp2
+        if meta.get("hit_tp3", False):
+            n, k = cfg.chand_post_tp3
         pad = k * atr5
         if is_long:
-            ll = _lowest(lows, n)
+            ll = _lowest((cache or FeatureCache(ctx.tf1m)).series("low", n), n)
             if ll is not None:
                 sl_new = min(sl_new, ll - pad)
         else:
-            hh = _highest(highs, n)
+            hh = _highest((cache or FeatureCache(ctx.tf1m)).series("high", n), n)
             if hh is not None:
                 sl_new = max(sl_new, hh + pad)
-    else:
-        # Fallback: fracR trail (post‑TP1 tuning)
-        mode = str(getattr(C, "TP_LOCK_STYLE", "trail_fracR"))
-        if mode == "to_tp1" and tp1:
-            sl_new = to_tp_lock(
-                sl_new,
-                is_long,
-                tp1,
-                atr_mult=float(getattr(C, "TP1_LOCK_ATR_MULT", 0.25)),
-                atr=atr5,
-            )
-            if tp2:
-                sl_new = to_tp_lock(
-                    sl_new,
-                    is_long,
-                    tp2,
-                    atr_mult=float(getattr(C, "TP2_LOCK_ATR_MULT", 0.35)),
-                    atr=atr5,
-                )
-        else:
-            default_frac1 = float(getattr(C, "TP1_LOCK_FRACR", 0.65))
-            base_frac1 = float(getattr(C, "POST_TP1_LOCK_FRACR", default_frac1))
-            if tp1:
-                sl_new = trail_fracR(
-                    sl_new,
-                    is_long,
-                    ctx.entry,
-                    tp1,
-                    frac=base_frac1,
-                    atr_pad=float(getattr(C, "TP1_LOCK_ATR_MULT", 0.25)) * atr5,
-                )
-            if tp2:
-                frac2 = float(getattr(C, "TP2_LOCK_FRACR", 0.75))
-                sl_new = trail_fracR(
-                    sl_new,
-                    is_long,
-                    ctx.entry,
-                    tp2,
-                    frac=frac2,
-                    atr_pad=float(getattr(C, "TP2_LOCK_ATR_MULT", 0.35)) * atr5,
-                )
-
-    # 1) Absolute $ lock from entry (if configured) — typically tiny insurance
-    abs_lock_usd = float(getattr(C, "SCALP_ABS_LOCK_USD", 0.0))
-    mfe_abs = float((ctx.meta or {}).get("mfe_abs", 0.0))
-    sl_new = abs_lock_from_entry(sl_new, is_long, ctx.entry, ctx.price, mfe_abs, abs_lock_usd)
-
-    # 2) Trail policy (to_tp or fracR with ML nudge)
-    mode = str(getattr(C, "TP_LOCK_STYLE", "trail_fracR"))
-    if mode == "to_tp1" and tp1:
-        sl_new = to_tp_lock(
+    elif mode != "to_tp1" and tp1:
+        # Fallback: fracR trail toward TP1 (post‑TP1 tuning). The TP2 / to_tp targets are
+        # applied once in step 2; locks are tighten-only, so running them here as well
+        # cannot change the result.
+        sl_new = trail_fracR(
             sl_new,
             is_long,
+            entry,
             tp1,
-            atr_mult=float(getattr(C, "TP1_LOCK_ATR_MULT", 0.25)),
-            atr=atr5,
+            frac=cfg.post_tp1_lock_fracr,
+            atr_pad=cfg.tp1_lock_atr_mult * atr5,
         )
-        if tp2:
-            sl_new = to_tp_lock(
-                sl_new,
-                is_long,
-                tp2,
-                atr_mult=float(getattr(C, "TP2_LOCK_ATR_MULT", 0.35)),
-                atr=atr5,
-            )
-    else:
-        base_frac1 = float(getattr(C, "TP1_LOCK_FRACR", 0.40))
-        delta1 = 0.0
-        if p_tp1 < 0.35:
-            delta1 = +0.15
-        elif p_tp1 > 0.70:
-            delta1 = -0.10
-        frac1 = max(0.20, min(0.80, base_frac1 + delta1))
-        if tp1:
-            sl_new = trail_fracR(
-                sl_new,
-                is_long,
-                ctx.entry,
-                tp1,
-                frac=frac1,
-                atr_pad=float(getattr(C, "TP1_LOCK_ATR_MULT", 0.25)) * atr5,
-            )
-        if tp2:
-            frac2 = float(getattr(C, "TP2_LOCK_FRACR", 0.75))
-            sl_new = trail_fracR(
-                sl_new,
-                is_long,
-                ctx.entry,
-                tp2,
-                frac=frac2,
-                atr_pad=float(getattr(C, "TP2_LOCK_ATR_MULT", 0.35)) * atr5,
-            )
-
-    # Optional momentum stall take‑profit near target
-    try:
-        stall_n = int(getattr(C, "STALL_BARS", 3))
-        stall_near = float(getattr(C, "STALL_NEAR_TP_ATR", 0.50)) * atr5
-        use_rsi = bool(getattr(C, "STALL_RSI_CONFIRM", True))
-        closes = _series(ctx.tf1m, "close")
-        rsi14 = _series(ctx.tf1m, "rsi14")
-        # Count bars against
-        if len(closes) >= stall_n + 1:
-            if is_long:
-                against = all((closes[-i] > closes[-i - 1]) for i in range(1, stall_n + 1))
-            else:
-                against = all((closes[-i] < closes[-i - 1]) for i in range(1, stall_n + 1))
-        else:
-            against = False
-        rsi_ok = True
-        if use_rsi and rsi14:
-            slope = _rsi_slope(rsi14, min(3, len(rsi14)))
-            rsi_ok = (slope < 0) if is_long else (slope > 0)
-        # Near any remaining TP?
-        near = False
-        for t in [t1, t2, t3]:
-            if t is None:
-                continue
-            if is_long and (t - ctx.price) <= stall_near and t >= ctx.price:
-                near = True
-                break
-            if (not is_long) and (ctx.price - t) <= stall_near and t <= ctx.price:
-                near = True
-                break
-        if against and rsi_ok and near:
-            # Propose immediate take by moving TP1 to market ± eps
-            eps = float(getattr(C, "STALL_TP_EPS", 0.02))
-            t_take = ctx.price + eps if (not is_long) else ctx.price - eps
-            t1 = round(t_take, 4)
-    except Exception:
-        pass
 
-    # 3) Guard SL by min‑gap and BE after TP1
-    sl_new = guard_min_gap(sl_new, is_long, ctx.price, ctx.entry, atr5)
-    if hit_tp1 and bool(getattr(C, "LOCK_NEVER_WORSE_THAN_BE", True)):
-        sl_new = be_floor(sl_new, is_long, ctx.entry)
+    # 1) Absolute $ lock from entry (if configured) — typically tiny insurance
+    abs_lock_usd = cfg.abs_lock_usd
+    mfe_abs = float(meta.get("mfe_abs", 0.0))
+    sl_new = abs_lock_from_entry(sl_new, is_long, entry, price, mfe_abs, abs_lock_usd)
 
-    # 4) TP maintenance: clamp base ladder; then adaptive widen **only after TP1**
-    t1, t2, t3 = clamp_tp1_distance(ctx.entry, ctx.sl, tp1, tp2, tp3, is_long, atr5)
+    # 2) Trail policy (to_tp or fracR with ML nudge)
+    delta1 = 0.0
+    if p_tp1 < 0.35:
+        delta1 = +0.15
+    elif p_tp1 > 0.70:
+        delta1 = -0.10
+    frac1 = max(0.20, min(0.80, cfg.tp1_lock_fracr + delta1))
+    sl_new = _lock_to_targets(sl_new, ctx, tp1, tp2, atr5, frac1, cfg)
+
+    # 3) Guard SL by min‑gap and BE after TP1
+    sl_new = guard_min_gap(sl_new, is_long, price, entry, atr5)
+    if hit_tp1 and cfg.lock_never_worse_than_be:
+        sl_new = be_floor(sl_new, is_long, entry)
 
+    # 4) TP maintenance: adaptive widen of the clamped ladder **only after TP1**
     adapt_used = "off"
-    if hit_tp1 and bool(getattr(C, "MODE_ADAPT_ENABLED", False)) and atr5 > 0.0:
-        regime = _detect_regime(ctx.price, atr5, adx14)
+    if hit_tp1 and cfg.mode_adapt_enabled and atr5 > 0.0:
+        regime = _detect_regime(price, atr5, adx14)
         if regime == "chop":
-            a1, a2, a3 = _parse_mults(
-                getattr(C, "MODE_CHOP_TP_ATR_MULTS", "0.60,1.00,1.50"),
-                "0.60,1.00,1.50",
-            )
+            a1, a2, a3 = cfg.chop_tp_atr_mults
         else:
-            a1, a2, a3 = _parse_mults(
-                getattr(C, "MODE_RALLY_TP_ATR_MULTS", "0.90,1.60,2.60"),
-                "0.90,1.60,2.60",
-            )
+            a1, a2, a3 = cfg.rally_tp_atr_mults
         # Build adaptive seeds from entry
         _d1, d2, d3 = a1 * atr5, a2 * atr5, a3 * atr5
         if is_long:
-            seed2, seed3 = ctx.entry + d2, ctx.entry + d3
+            seed2, seed3 = entry + d2, entry + d3
             # extend-only for longs
             t2 = max(t2, round(seed2, 4)) if t2 is not None else round(seed2, 4)
             t3 = max(t3, round(seed3, 4)) if t3 is not None else round(seed3, 4)
         else:
-            seed2, seed3 = ctx.entry - d2, ctx.entry - d3
+            seed2, seed3 = entry - d2, entry - d3
             # extend-only for shorts
             t2 = min(t2, round(seed2, 4)) if t2 is not None else round(seed2, 4)
             t3 = min(t3, round(seed3, 4)) if t3 is not None else round(seed3, 4)
@@ -532,9 +589,8 @@ def propose(ctx: Context) -> Proposal:
     t1, t2, t3 = ensure_order(t1, t2, t3, is_long)
 
     why = f"p_tp1={p_tp1:.2f} mode={mode} adapt={adapt_used}"
-    out_tps = [x for x in (t1, t2, t3) if x is not None]
     return Proposal(
         sl=round(sl_new, 4),
-        tps=out_tps,
+        tps=_tp_list(t1, t2, t3),
         why=why,
     )
@@ -1,82 +1,210 @@
+import atexit
 import json
 import sqlite3
-import time
-from typing import Dict, List
+import threading
+from collections import deque
+from time import time as _now
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from . import config as C
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
 
-def _conn() -> sqlite3.Connection:
-    """Return a SQLite connection."""
-    return sqlite3.connect(C.DB_PATH)
+# One long-lived autocommit connection (WAL); SQL text is kept constant so the
+# connection's statement cache reuses the compiled statements.
+_CON: Optional[sqlite3.Connection] = None
+_LOCK = threading.Lock()
 
+_SQL_INS_ZONE = "INSERT INTO memory_zones(created_ts,pair,kind,payload_json) VALUES(?,?,?,?)"
+_SQL_SEL_ZONES = (
+    "SELECT created_ts,kind,payload_json FROM memory_zones WHERE pair=? ORDER BY id DESC LIMIT ?"
+)
+_SQL_INS_LESSON = (
+    "INSERT INTO lessons("
+    "created_ts,pair,outcome,entry_price,exit_price,mfe,mae,features_json,notes"
+    ") VALUES(?,?,?,?,?,?,?,?,?)"
+)
+_SQL_SEL_LESSONS = (
+    "SELECT created_ts,outcome,entry_price,exit_price,mfe,mae,features_json,notes "
+    "FROM lessons WHERE pair=? ORDER BY id DESC LIMIT ?"
+)
 
-def init_memory_tables() -> None:
-    con = _conn()
-    cur = con.cursor()
-
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS memory_zones(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_ts INTEGER,
-            pair TEXT,
-            kind TEXT,
-            payload_json TEXT
-        )
-        """
-    )
+# Write buffer: rows are serialized by the caller and committed in bulk, either once
+# FLUSH_ROWS are pending or FLUSH_MS after the first pending row. Reads flush first.
+FLUSH_ROWS = 64
+FLUSH_MS = 250
 
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS lessons(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_ts INTEGER,
-            pair TEXT,
-            outcome TEXT,
-            entry_price REAL,
-            exit_price REAL,
-            mfe REAL,
-            mae REAL,
-            features_json TEXT,
-            notes TEXT
-        )
-        """
-    )
+_zone_queue: Deque[Tuple] = deque()
+_lesson_queue: Deque[Tuple] = deque()
+_timer: Optional[threading.Timer] = None
+_TIMER_LOCK = threading.Lock()
 
-    con.commit()
-    con.close()
 
+def _now_ms() -> int:
+    return int(_now() * 1000)
 
-def store_zone(pair: str, kind: str, payload: Dict) -> None:
-    con = _conn()
-    cur = con.cursor()
 
-    cur.execute(
-        "INSERT INTO memory_zones(created_ts,pair,kind,payload_json) VALUES(?,?,?,?)",
-        (int(time.time() * 1000), pair, kind, json.dumps(payload)),
-    )
+def _dumps(obj: Dict) -> str:
+    """JSON-encode a payload as text for the *_json TEXT columns."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
 
-    con.commit()
-    con.close()
 
+# Both accept str (TEXT rows) and bytes (BLOB rows written by earlier builds)
+_loads = orjson.loads if orjson is not None else json.loads
 
-def latest_zones(pair: str, limit: int = 5) -> List[Dict]:
-    con = _conn()
-    cur = con.cursor()
 
-    cur.execute(
-        "SELECT created_ts,kind,payload_json "
-        "FROM memory_zones WHERE pair=? ORDER BY id DESC LIMIT ?",
-        (pair, limit),
-    )
+def _conn() -> sqlite3.Connection:
+    """Return the shared SQLite connection (opened on first use)."""
+    global _CON
+    if _CON is None:
+        con = sqlite3.connect(
+            C.DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=64
+        )
+        try:
+            con.execute("PRAGMA journal_mode=WAL;")
+            con.execute("PRAGMA synchronous=NORMAL;")
+            con.execute("PRAGMA temp_store=MEMORY;")
+        except Exception:
+            pass
+        _CON = con
+    return _CON
 
-    rows = [{"ts": r[0], "kind": r[1], "payload": json.loads(r[2])} for r in cur.fetchall()]
 
-    con.close()
+def _drain(q: Deque[Tuple]) -> List[Tuple]:
+    rows = []
+    while q:
+        rows.append(q.popleft())
     return rows
 
 
+def flush_memory() -> None:
+    """Commit all buffered zones/lessons in one transaction.
+
+    On failure the rows go back to the front of their queues (nothing is lost) and the
+    error is raised to the caller.
+    """
+    global _timer
+    with _TIMER_LOCK:
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    with _LOCK:
+        zones, lessons = _drain(_zone_queue), _drain(_lesson_queue)
+        if not (zones or lessons):
+            return
+        try:
+            con = _conn()
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                if zones:
+                    con.executemany(_SQL_INS_ZONE, zones)
+                if lessons:
+                    con.executemany(_SQL_INS_LESSON, lessons)
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+        except Exception:
+            _zone_queue.extendleft(reversed(zones))
+            _lesson_queue.extendleft(reversed(lessons))
+            raise
+
+
+def _flush_background() -> None:
+    """Timer/threshold/read-path flush: a failed write is logged and its rows stay queued
+    instead of surfacing in whichever unrelated caller happened to trigger the flush."""
+    try:
+        flush_memory()
+    except Exception as e:
+        print("[MEMORY FLUSH ERROR]", e, flush=True)
+
+
+def _schedule_flush() -> None:
+    global _timer
+    if len(_zone_queue) + len(_lesson_queue) >= FLUSH_ROWS:
+        _flush_background()
+        return
+    with _TIMER_LOCK:
+        if _timer is None:
+            _timer = threading.Timer(FLUSH_MS / 1000.0, _flush_background)
+            _timer.daemon = True
+            _timer.start()
+
+
+def close_memory() -> None:
+    """Flush pending rows and close the shared connection (the next call reopens it)."""
+    global _CON
+    _flush_background()
+    with _LOCK:
+        if _CON is not None:
+            try:
+                # Refresh planner stats for the (pair, id DESC) indexes; cheap when current
+                _CON.execute("PRAGMA optimize;")
+            except Exception:
+                pass
+            _CON.close()
+            _CON = None
+
+
+atexit.register(close_memory)
+
+
+def init_memory_tables() -> None:
+    with _LOCK:
+        con = _conn()
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memory_zones(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_ts INTEGER,
+                pair TEXT,
+                kind TEXT,
+                payload_json TEXT
+            )
+            """
+        )
+        con.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lessons(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_ts INTEGER,
+                pair TEXT,
+                outcome TEXT,
+                entry_price REAL,
+                exit_price REAL,
+                mfe REAL,
+                mae REAL,
+                features_json TEXT,
+                notes TEXT
+            )
+            """
+        )
+        # latest_zones / recent_lessons: WHERE pair=? ORDER BY id DESC LIMIT ?
+        con.execute("CREATE INDEX IF NOT EXISTS ix_zones_pair_id ON memory_zones(pair, id DESC)")
+        con.execute("CREATE INDEX IF NOT EXISTS ix_lessons_pair_id ON lessons(pair, id DESC)")
+
+
+def store_zone(pair: str, kind: str, payload: Dict) -> None:
+    _zone_queue.append((_now_ms(), pair, kind, _dumps(payload)))
+    _schedule_flush()
+
+
+def latest_zones(pair: str, limit: int = 5) -> List[Dict]:
+    _flush_background()
+    with _LOCK:
+        fetched = _conn().execute(_SQL_SEL_ZONES, (pair, limit)).fetchall()
+    loads = _loads
+    return [{"ts": r[0], "kind": r[1], "payload": loads(r[2])} for r in fetched]
+
+
 def store_lesson(
     pair: str,
     outcome: str,
@@ -87,63 +215,58 @@ def store_lesson(
     features: Dict,
     notes: str = "",
 ) -> None:
-    con = _conn()
-    cur = con.cursor()
-
-    cur.execute(
-        """
-        INSERT INTO lessons(
-            created_ts,
-            pair,
-            outcome,
-            entry_price,
-            exit_price,
-            mfe,
-            mae,
-            features_json,
-            notes
-        ) VALUES(?,?,?,?,?,?,?,?,?)
-        """,
-        (
-            int(time.time() * 1000),
-            pair,
-            outcome,
-            entry,
-            exit_px,
-            mfe,
-            mae,
-            json.dumps(features),
-            notes,
-        ),
+    row = (
+        _now_ms(),
+        pair,
+        outcome,
+        entry,
+        exit_px,
+        mfe,
+        mae,
+        _dumps(features),
+        notes,
     )
+    _lesson_queue.append(row)
+    _schedule_flush()
 
-    con.commit()
-    con.close()
 
+class Lesson(NamedTuple):
+    """One ``lessons`` row; ``features`` is decoded from ``features_json`` on access."""
 
-def recent_lessons(pair: str, limit: int = 20) -> List[Dict]:
-    con = _conn()
-    cur = con.cursor()
+    ts: int
+    outcome: str
+    entry: float
+    exit: float
+    mfe: float
+    mae: float
+    features_json: Union[bytes, str]
+    notes: str
+
+    @property
+    def features(self) -> Dict:
+        return _loads(self.features_json)
 
-    cur.execute(
-        "SELECT created_ts,outcome,entry_price,exit_price,mfe,mae,features_json,notes "
-        "FROM lessons WHERE pair=? ORDER BY id DESC LIMIT ?",
-        (pair, limit),
-    )
 
-    rows = [
+def iter_lessons(pair: str, limit: int = 20) -> Iterator[Lesson]:
+    """Newest-first lessons as ``Lesson`` tuples, without decoding the features JSON."""
+    _flush_background()
+    with _LOCK:
+        fetched = _conn().execute(_SQL_SEL_LESSONS, (pair, limit)).fetchall()
+    return map(Lesson._make, fetched)
+
+
+def recent_lessons(pair: str, limit: int = 20) -> List[Dict]:
+    # Plain dicts: ai_rm embeds these in a JSON prompt
+    return [
         {
-            "ts": r[0],
-            "outcome": r[1],
-            "entry": r[2],
-            "exit": r[3],
-            "mfe": r[4],
-            "mae": r[5],
-            "features": json.loads(r[6]),
-            "notes": r[7],
+            "ts": r.ts,
+            "outcome": r.outcome,
+            "entry": r.entry,
+            "exit": r.exit,
+            "mfe": r.mfe,
+            "mae": r.mae,
+            "features": r.features,
+            "notes": r.notes,
         }
-        for r in cur.fetchall()
+        for r in iter_lessons(pair, limit)
     ]
-
-    con.close()
-    return rows
@@ -1,3 +1,4 @@
+import heapq
 from typing import Any, Optional, Protocol, cast
 
 from . import config as C
@@ -15,6 +16,11 @@ try:
     _telemetry = cast(_TelemetryProto, _telemetry_mod)
 except Exception:
     _telemetry = None
+# telemetry.log never raises (it catches its own JSON/DB errors), so call sites need no try.
+# Left unbound when telemetry is disabled so callers skip building the message/payload.
+_telemetry_log = (
+    _telemetry.log if _telemetry is not None and getattr(_telemetry, "ENABLED", True) else None
+)
 # Determine enabled engines from config
 _def_order = ["trendscalp"]
 try:
@@ -24,32 +30,44 @@ try:
         _ENGINE_ORDER = [s.strip().lower() for s in _ENGINE_ORDER.split(",") if s.strip()]
 except Exception:
     _ENGINE_ORDER = _def_order
+_ONLY_TS_MODE: bool = _ENGINE_ORDER == ["trendscalp"]
+
+# Config is fixed after startup; read the flags the formatters use once at import
+_TG_DEBUG_VALIDATORS = bool(getattr(C, "TG_DEBUG_VALIDATORS", False))
+_TS_USE_RSI_FILTER = bool(getattr(C, "TS_USE_RSI_FILTER", True))
+_TS_USE_REGIME_FILTER = bool(getattr(C, "TS_USE_REGIME_FILTER", True))
+# Shared empty meta for read-only helpers (never mutated)
+_NO_META: dict = {}
+# Fallback TrendScalp filter config (read-only; shared by every caller)
+_DEFAULT_TS_CFG = {
+    "TS_VOL_FLOOR_PCT": float(getattr(C, "TS_VOL_FLOOR_PCT", 0.0012)),
+    "TS_ADX_MIN": float(getattr(C, "TS_ADX_MIN", 20)),
+    "TS_TL_WIDTH_ATR_MULT": float(getattr(C, "TS_TL_WIDTH_ATR_MULT", 0.42)),
+}
 
 
 def _trendscalp_is_only_engine(meta: dict) -> bool:
-    eng = (meta or {}).get("engine", "").lower()
-    only_ts = _ENGINE_ORDER == ["trendscalp"] or (
-        len(_ENGINE_ORDER) == 1 and _ENGINE_ORDER[0] == "trendscalp"
-    )
-    return only_ts or (eng == "trendscalp")
+    return _ONLY_TS_MODE or (meta or _NO_META).get("engine", "").lower() == "trendscalp"
 
 
 def _dbg_meta_block(meta: dict, note: str = "") -> str:
-    if not getattr(C, "TG_DEBUG_VALIDATORS", False):
+    if not _TG_DEBUG_VALIDATORS:
         return ""
-    m = dict(meta or {})
-    keys = sorted(list(m.keys()))
+    m = meta or _NO_META
     state, cfg = _coalesce_state_cfg(m) if "_coalesce_state_cfg" in globals() else ({}, {})
-    s_keys = sorted(list(state.keys())) if isinstance(state, dict) else []
-    c_keys = sorted(list(cfg.keys())) if isinstance(cfg, dict) else []
+    if not isinstance(state, dict):
+        state = _NO_META
+    if not isinstance(cfg, dict):
+        cfg = _NO_META
     lines = ["\nDEBUG:"]
     lines.append(f"• note: {note}" if note else "• validators missing")
-    keys_str = ", ".join(keys[:20])
-    s_keys_str = ", ".join(s_keys[:20])
-    c_keys_str = ", ".join(c_keys[:20])
-    lines.append(f"• meta.keys: {keys_str}{' …' if len(keys) > 20 else ''}")
-    lines.append(f"• state.keys: {s_keys_str}{' …' if len(s_keys) > 20 else ''}")
-    lines.append(f"• cfg.keys: {c_keys_str}{' …' if len(c_keys) > 20 else ''}")
+    # First 20 keys in sorted order, without sorting the whole dict
+    keys_str = ", ".join(heapq.nsmallest(20, m))
+    s_keys_str = ", ".join(heapq.nsmallest(20, state))
+    c_keys_str = ", ".join(heapq.nsmallest(20, cfg))
+    lines.append(f"• meta.keys: {keys_str}{' …' if len(m) > 20 else ''}")
+    lines.append(f"• state.keys: {s_keys_str}{' …' if len(state) > 20 else ''}")
+    lines.append(f"• cfg.keys: {c_keys_str}{' …' if len(cfg) > 20 else ''}")
     # try to surface common fields even if paths changed
     probe = {
         "atr14_last": m.get("atr14_last") or state.get("atr14_last"),
@@ -65,41 +83,46 @@ def _dbg_meta_block(meta: dict, note: str = "") -> str:
         lines.append("• probe: " + ", ".join(found))
     out = "\n".join(lines)
     # also mirror to telemetry if available
-    try:
-        if _telemetry is not None:
-            _telemetry.log("tgdebug", "VALIDATORS_MISSING", out, {})
-    except Exception:
-        pass
+    if _telemetry_log is not None:
+        _telemetry_log("tgdebug", "VALIDATORS_MISSING", out, {})
     return out
 
 
 def _ensure_ts_meta(meta: dict, price: Optional[float] = None) -> dict:
-    """Ensure meta has sensible defaults for TrendScalp messaging."""
+    """Ensure meta has sensible defaults for TrendScalp messaging.
+
+    Already-canonical meta (engine, filter_state, filter_cfg and a float price) is returned
+    as-is; otherwise a backfilled copy. Callers treat the result as read-only.
+    """
+    if (
+        meta
+        and meta.get("engine")
+        and "filter_state" in meta
+        and "filter_cfg" in meta
+        and type(meta.get("price")) is float
+    ):
+        return meta
     m = dict(meta or {})
     if not m.get("engine"):
         m["engine"] = "trendscalp"
     # Inject price whenever caller provided one and meta price is missing or None
-    if price is not None and (("price" not in m) or (m.get("price") is None)):
+    if price is not None and m.get("price") is None:
         try:
             m["price"] = float(price)
         except Exception:
             m["price"] = price
+    elif m.get("price") is not None:
+        try:
+            m["price"] = float(m["price"])
+        except Exception:
+            pass
     # Backfill legacy shapes so downstream formatters always find what they need
     if "filter_state" not in m:
-        if isinstance(m.get("validators"), dict):
-            m["filter_state"] = dict(m["validators"])
-        elif isinstance(m.get("filters"), dict):
-            m["filter_state"] = dict(m["filters"])
+        if isinstance(v := m.get("validators"), dict) or isinstance(v := m.get("filters"), dict):
+            m["filter_state"] = dict(v)
     if "filter_cfg" not in m:
-        if isinstance(m.get("cfg"), dict):
-            m["filter_cfg"] = dict(m["cfg"])
-        elif isinstance(m.get("config"), dict):
-            m["filter_cfg"] = dict(m["config"])
-    try:
-        if m.get("price") is not None:
-            m["price"] = float(m["price"])
-    except Exception:
-        pass
+        if isinstance(v := m.get("cfg"), dict) or isinstance(v := m.get("config"), dict):
+            m["filter_cfg"] = dict(v)
     return m
 
 
@@ -110,8 +133,9 @@ def _coalesce_state_cfg(meta: dict) -> tuple:
       - filter_state/filter_cfg (current)
       - validators/filters (older alias for state)
       - cfg/config (older alias for cfg)
+    Read-only: ``meta`` is not copied or modified.
     """
-    m = dict(meta or {})
+    m = meta or _NO_META
 
     # 1) Preferred keys
     state = m.get("filter_state")
@@ -155,38 +179,34 @@ def _coalesce_state_cfg(meta: dict) -> tuple:
 # === Inserted helpers for TrendScalp config/state backfill ===
 def _default_ts_cfg() -> dict:
     """Fallback TrendScalp filter config from env-config if caller didn't pass cfg."""
-    return {
-        "TS_VOL_FLOOR_PCT": float(getattr(C, "TS_VOL_FLOOR_PCT", 0.0012)),
-        "TS_ADX_MIN": float(getattr(C, "TS_ADX_MIN", 20)),
-        "TS_TL_WIDTH_ATR_MULT": float(getattr(C, "TS_TL_WIDTH_ATR_MULT", 0.42)),
-    }
+    return _DEFAULT_TS_CFG
+
+
+# Flat meta keys that make up a TrendScalp filter state (in display order)
+_TS_STATE_KEYS = (
+    "atr14_last",
+    "adx_last",
+    "rsi15",
+    "ema200_5",
+    "ema200_15",
+    "regime_ok",
+    "vol_ok",
+    "adx_ok",
+    "rsi_block",
+    "ma_long_ok",
+    "ma_short_ok",
+    "upper_break",
+    "lower_break",
+    "ema_up",
+    "ema_dn",
+    "tl_width",
+)
 
 
 def _raw_state_from_meta(m: dict) -> dict:
     """Build a best-effort state dict from flat meta keys when filter_state is missing."""
-    m = dict(m or {})
-    s = {}
-    for k in (
-        "atr14_last",
-        "adx_last",
-        "rsi15",
-        "ema200_5",
-        "ema200_15",
-        "regime_ok",
-        "vol_ok",
-        "adx_ok",
-        "rsi_block",
-        "ma_long_ok",
-        "ma_short_ok",
-        "upper_break",
-        "lower_break",
-        "ema_up",
-        "ema_dn",
-        "tl_width",
-    ):
-        if m.get(k) is not None:
-            s[k] = m.get(k)
-    return s
+    m = m or _NO_META
+    return {k: v for k in _TS_STATE_KEYS if (v := m.get(k)) is not None}
 
 
 # === Inserted: Compact debug of what messaging.py received from the caller ===
@@ -196,18 +216,14 @@ def _dbg_rx(func_name: str, price: Optional[float], meta: dict) -> str:
     Always mirrors to telemetry (channel: tgdebug | event: MSG_INPUT) when TG_DEBUG_VALIDATORS=True.
     Returns a short text block you can embed into TG messages.
     """
-    if not getattr(C, "TG_DEBUG_VALIDATORS", False):
+    if not _TG_DEBUG_VALIDATORS:
         return ""
-    try:
-        m = _ensure_ts_meta(meta, price)
-    except Exception:
-        m = dict(meta or {})
-        if price is not None:
-            m.setdefault("price", price)
+    # Callers pass the dict _ensure_ts_meta already built (price/engine backfilled)
+    m = meta or _NO_META
     state, cfg = _coalesce_state_cfg(m)
-    meta_keys = sorted(list(m.keys()))[:20]
-    state_keys = sorted(list(state.keys()))[:20] if isinstance(state, dict) else []
-    cfg_keys = sorted(list(cfg.keys()))[:20] if isinstance(cfg, dict) else []
+    meta_keys = heapq.nsmallest(20, m)
+    state_keys = heapq.nsmallest(20, state) if isinstance(state, dict) else []
+    cfg_keys = heapq.nsmallest(20, cfg) if isinstance(cfg, dict) else []
     # surface most important probes if present
     probe = {
         "atr14_last": (state or {}).get("atr14_last", m.get("atr14_last")),
@@ -220,24 +236,21 @@ def _dbg_rx(func_name: str, price: Optional[float], meta: dict) -> str:
     }
     probe_found = {k: v for k, v in probe.items() if v is not None}
     # mirror to telemetry
-    try:
-        if _telemetry is not None:
-            _telemetry.log(
-                "tgdebug",
-                "MSG_INPUT",
-                f"{func_name} received — engine={m.get('engine', '?')} price={m.get('price')}",
-                {
-                    "func": func_name,
-                    "engine": (m or {}).get("engine"),
-                    "price": (m or {}).get("price"),
-                    "meta_keys": meta_keys,
-                    "state_keys": state_keys,
-                    "cfg_keys": cfg_keys,
-                    "probe": probe_found,
-                },
-            )
-    except Exception:
-        pass
+    if _telemetry_log is not None:
+        _telemetry_log(
+            "tgdebug",
+            "MSG_INPUT",
+            f"{func_name} received — engine={m.get('engine', '?')} price={m.get('price')}",
+            {
+                "func": func_name,
+                "engine": (m or {}).get("engine"),
+                "price": (m or {}).get("price"),
+                "meta_keys": meta_keys,
+                "state_keys": state_keys,
+                "cfg_keys": cfg_keys,
+                "probe": probe_found,
+            },
+        )
     # build small inline block for TG
     lines = [
         "\nDEBUG RX:",
@@ -269,9 +282,14 @@ def fmt_levels(meta):
 
 def fmt_validators_trendscalp(meta):
     state, cfg = _coalesce_state_cfg(meta)
+    if not state:
+        # Nothing populated yet (cold start): only the regime toggle can render
+        if not _TS_USE_REGIME_FILTER and cfg.get("TS_TL_WIDTH_ATR_MULT") is not None:
+            return "Regime (disabled)"
+        return ""
     parts = []
-    use_rsi_filter = bool(getattr(C, "TS_USE_RSI_FILTER", True))
-    use_regime_filter = bool(getattr(C, "TS_USE_REGIME_FILTER", True))
+    use_rsi_filter = _TS_USE_RSI_FILTER
+    use_regime_filter = _TS_USE_REGIME_FILTER
     # ATR floor
     atr = state.get("atr14_last")
     floor = cfg.get("TS_VOL_FLOOR_PCT")
@@ -316,7 +334,7 @@ def fmt_validators_trendscalp(meta):
             parts.append("Regime (disabled)")
         elif state.get("regime_ok") is not None:
             parts.append(f"Regime (TLwidth vs ATR) {'✓' if state.get('regime_ok') else '✗'}")
-    if not parts and getattr(C, "TG_DEBUG_VALIDATORS", False):
+    if not parts and _TG_DEBUG_VALIDATORS:
         return ""
     return " | ".join(parts)
 
@@ -324,8 +342,8 @@ def fmt_validators_trendscalp(meta):
 def fmt_details_trendscalp(meta):
     state, cfg = _coalesce_state_cfg(meta)
     p = (meta or {}).get("price")
-    use_rsi_filter = bool(getattr(C, "TS_USE_RSI_FILTER", True))
-    use_regime_filter = bool(getattr(C, "TS_USE_REGIME_FILTER", True))
+    use_rsi_filter = _TS_USE_RSI_FILTER
+    use_regime_filter = _TS_USE_REGIME_FILTER
     if not state:
         return ""
     lines = []
@@ -428,8 +446,8 @@ def _fmt_regime_line(meta: dict) -> str:
 def suggest_next_step_trendscalp(meta):
     state, cfg = _coalesce_state_cfg(meta)
     need = []
-    use_rsi_filter = bool(getattr(C, "TS_USE_RSI_FILTER", True))
-    use_regime_filter = bool(getattr(C, "TS_USE_REGIME_FILTER", True))
+    use_rsi_filter = _TS_USE_RSI_FILTER
+    use_regime_filter = _TS_USE_REGIME_FILTER
     # Map failed gates to actionable guidance
     if use_rsi_filter and state.get("rsi_block"):
         need.append("• RSI(15m) must leave 45–55; >50 for LONG, <50 for SHORT.")
@@ -481,10 +499,9 @@ def suggest_next_step_trendscalp(meta):
 def suggest_next_step(price, meta):
     if _trendscalp_is_only_engine(meta):
         try:
-            # Inject price for ATRfloor % display if available
-            if meta is not None:
-                meta = dict(meta)
-                meta.setdefault("price", price)
+            # Inject price for ATRfloor % display if available (copy only when missing)
+            if meta is not None and "price" not in meta:
+                meta = {**meta, "price": price}
             return suggest_next_step_trendscalp(meta)
         except Exception:
             pass
@@ -517,7 +534,7 @@ def suggest_next_step(price, meta):
 
 def no_trade_message(price, reason, meta):
     m = _ensure_ts_meta(meta, price)
-    rx_block = _dbg_rx("no_trade_message", price, m)
+    rx_block = _dbg_rx("no_trade_message", price, m) if _TG_DEBUG_VALIDATORS else ""
     elig = m.get("eligibility", {})
     extra = ""
     if elig:
@@ -542,7 +559,7 @@ def no_trade_message(price, reason, meta):
     avoid = fmt_avoid(m)
     avoid_line = "" if not avoid else f"Avoid zones: {avoid}\n"
     debug_block = ""
-    if not validators_line:
+    if not validators_line and _TG_DEBUG_VALIDATORS:
         debug_block = _dbg_meta_block(m, note="no_trade_message")
     regime_line = _fmt_regime_line(m)
     return (
@@ -562,8 +579,8 @@ def no_trade_message(price, reason, meta):
 
 
 def signal_message(sig):
-    m = _ensure_ts_meta(getattr(sig, "meta", {}) or {}, getattr(sig, "entry", None))
-    rx_block = _dbg_rx("signal_message", getattr(sig, "entry", None), m)
+    m = _ensure_ts_meta(sig.meta, sig.entry)
+    rx_block = _dbg_rx("signal_message", sig.entry, m) if _TG_DEBUG_VALIDATORS else ""
     validators_str = fmt_validators(m)
     validators_line = f"Validators: {validators_str}\n" if validators_str else ""
     details_str = (
@@ -573,7 +590,7 @@ def signal_message(sig):
     )
     details_block = (details_str + "\n") if details_str else ""
     debug_block = ""
-    if not validators_line:
+    if not validators_line and _TG_DEBUG_VALIDATORS:
         debug_block = _dbg_meta_block(m, note="signal_message")
     tps_str = ", ".join([f"{t:.4f}" for t in sig.tps])
     regime_line = _fmt_regime_line(m)
@@ -592,15 +609,15 @@ def signal_message(sig):
 
 
 def invalidation_message(reason, draft, price):
-    m = _ensure_ts_meta(getattr(draft, "meta", {}) or {}, price)
-    rx_block = _dbg_rx("invalidation_message", price, m)
+    m = _ensure_ts_meta(draft.meta, price)
+    rx_block = _dbg_rx("invalidation_message", price, m) if _TG_DEBUG_VALIDATORS else ""
     details_str = (
         fmt_details_trendscalp(m)
         if (_trendscalp_is_only_engine(m) or ("filter_state" in m))
         else ""
     )
     details_block = (details_str + "\n") if details_str else ""
-    debug_block = _dbg_meta_block(m, note="invalidation_message")
+    debug_block = _dbg_meta_block(m, note="invalidation_message") if _TG_DEBUG_VALIDATORS else ""
     regime_line = _fmt_regime_line(m)
     return (
         f"⚠️ INVALIDATED — {C.PAIR}\n"
@@ -618,21 +635,21 @@ def invalidation_message(reason, draft, price):
 def extension_message(draft, price):
     return (
         f"📈 PROFIT EXTENSION — {C.PAIR}\n"
-        f"Engine: {(getattr(draft, 'meta', {}) or {}).get('engine', '—')}\n"
+        f"Engine: {(draft.meta or _NO_META).get('engine', '—')}\n"
         f"{draft.side} running. Last {price:.4f} > TP3. Added reduce-only TP.\n"
         f"Context: {fmt_levels(draft.meta)} | {fmt_validators(draft.meta)}"
     )
 
 
 def _manual_close_context_line(draft, price_now):
-    meta_now = _ensure_ts_meta(getattr(draft, "meta", {}) or {}, price_now)
+    meta_now = _ensure_ts_meta(draft.meta, price_now)
     return f"Context: {fmt_levels(meta_now)} | {fmt_validators(meta_now)}"
 
 
 def manual_close_message(pair, exit_px, pnl, draft, price_now):
     return (
         f"🧑‍💻 MANUAL CLOSE DETECTED — {pair}\n"
-        f"Engine: {(getattr(draft, 'meta', {}) or {}).get('engine', '—')}\n"
+        f"Engine: {(draft.meta or _NO_META).get('engine', '—')}\n"
         f"Exit {exit_px:.4f} | PnL {pnl:.2f}\n"
         f"We’ll wait for the next valid setup.\n"
         f"Next:\n{suggest_next_step(price_now, draft.meta)}\n"
@@ -645,7 +662,7 @@ def audit_block_message(draft, verdict):
     why = why if why else "Not approved by auditor"
     return (
         f"🛑 AUDIT BLOCKED — {C.PAIR}\n"
-        f"Engine: {(getattr(draft, 'meta', {}) or {}).get('engine', '—')}\n"
+        f"Engine: {(draft.meta or _NO_META).get('engine', '—')}\n"
         f"Proposed: {draft.side} @ {draft.entry:.4f} | SL {draft.sl:.4f} | TPs {draft.tps}\n"
         f"Reason: {why}"
     )
@@ -1,15 +1,70 @@
+import asyncio
+import json
+from typing import List, Optional
+
 import aiohttp
 
 from . import config as C
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
 
-async def tg_send(text: str):
-    if not C.TG_TOKEN or not C.TG_CHAT_ID:
-        return
-    url = f"https://api.telegram.org/bot{C.TG_TOKEN}/sendMessage"
-    async with aiohttp.ClientSession() as s:
-        try:
-            r = await s.post(url, json={"chat_id": C.TG_CHAT_ID, "text": text}, timeout=10)
+# Bot credentials are fixed at startup; build the endpoint once ("" = no bot configured)
+_URL: str = f"https://api.telegram.org/bot{C.TG_TOKEN}/sendMessage" if C.TG_TOKEN else ""
+_CHAT_ID = C.TG_CHAT_ID
+
+
+def _json_serialize(obj: dict) -> str:
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
+
+# One keep-alive session for all sends (reuses the TLS connection to api.telegram.org)
+_session: Optional[aiohttp.ClientSession] = None
+
+# Outgoing queue: messages that pile up while a send is in flight go out as one message
+_SEP = "\n\n---\n\n"
+_COALESCE_MAX = 3900  # stay under Telegram's 4096-char limit
+_queue: Optional["asyncio.Queue[str]"] = None
+_sender: Optional["asyncio.Task[None]"] = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use (must run inside the event loop).
+
+    No lock needed: there is no ``await`` between the check and the assignment.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=10),
+            json_serialize=_json_serialize,
+        )
+    return _session
+
+
+async def close_session() -> None:
+    """Deliver queued messages, stop the sender and close the shared session
+    (call before the event loop shuts down)."""
+    global _session, _sender
+    if _sender is not None:
+        if _queue is not None and not _sender.done():
+            try:
+                await asyncio.wait_for(_queue.join(), timeout=15)
+            except asyncio.TimeoutError:
+                pass
+        _sender.cancel()
+        _sender = None
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def _post(text: str) -> None:
+    try:
+        async with _get_session().post(_URL, json={"chat_id": _CHAT_ID, "text": text}) as r:
             if r.status != 200:
                 # Try to extract Telegram error description for clarity
                 body_text = await r.text()
@@ -21,6 +76,38 @@ async def tg_send(text: str):
                     # response was not JSON
                     pass
                 print("[TG] HTTP", r.status, desc)
-        except Exception as e:
-            # Many network timeouts raise exceptions with empty str(e); include the class name
-            print("[TG] Exception:", type(e).__name__, repr(e))
+    except Exception as e:
+        # Many network timeouts raise exceptions with empty str(e); include the class name
+        print("[TG] Exception:", type(e).__name__, repr(e))
+
+
+async def _sender_loop(q: "asyncio.Queue[str]") -> None:
+    carry: Optional[str] = None
+    while True:
+        buf: List[str] = [carry if carry is not None else await q.get()]
+        carry = None
+        size = len(buf[0])
+        while not q.empty():
+            nxt = q.get_nowait()
+            if size + len(_SEP) + len(nxt) > _COALESCE_MAX:
+                carry = nxt
+                break
+            buf.append(nxt)
+            size += len(_SEP) + len(nxt)
+        try:
+            await _post(_SEP.join(buf))
+        finally:
+            for _ in buf:
+                q.task_done()
+
+
+async def tg_send(text: str):
+    """Queue ``text`` for delivery; returns without waiting for the HTTP round trip."""
+    global _queue, _sender
+    if not _URL or not _CHAT_ID:
+        return
+    if _queue is None:
+        _queue = asyncio.Queue()
+    if _sender is None or _sender.done():
+        _sender = asyncio.get_running_loop().create_task(_sender_loop(_queue))
+    _queue.put_nowait(text)
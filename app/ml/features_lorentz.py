@@ -1,66 +1,112 @@
 from __future__ import annotations
 
-from typing import Dict, List
-
-
-def build_features(tf5: Dict[str, List[float]]) -> Dict[str, List[float]]:
-    closes = tf5.get("close", [])
-    highs = tf5.get("high", [])
-    lows = tf5.get("low", [])
-
-    # Minimal placeholder; real version will use pandas-ta
-    def ema(arr: List[float], n: int) -> List[float]:
-        if not arr:
-            return []
-        n = max(1, int(n))
-        k = 2.0 / (n + 1.0)
-        out = [float(arr[0])]
-        for i in range(1, len(arr)):
-            out.append(out[-1] + k * (float(arr[i]) - out[-1]))
-        return out
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .._njit import HAS_NUMBA, njit
+from ..indicators import as_f64, ewm_iir, wilder
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _features_kernel(
+    c: np.ndarray, h: np.ndarray, lo: np.ndarray, n_ema1: int, n_ema2: int, n_rsi: int, n_atr: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """EMA(n_ema1), EMA(n_ema2), RSI(n_rsi) and ATR(n_atr) in one pass over the bars.
+
+    Same recurrences as ``_ema`` / ``_rsi`` / ``_atr``; the caller guarantees equal,
+    non-zero lengths.
+    """
+    m = c.shape[0]
+    k1 = 2.0 / (n_ema1 + 1.0)
+    k2 = 2.0 / (n_ema2 + 1.0)
+    a_atr = 1.0 / n_atr
+    e1 = np.empty(m)
+    e2 = np.empty(m)
+    rs = np.empty(m)
+    at = np.empty(m)
+    v1 = c[0]
+    v2 = c[0]
+    up = 0.0
+    dn = 0.0
+    va = h[0] - lo[0]
+    e1[0] = v1
+    e2[0] = v2
+    rs[0] = 50.0
+    at[0] = va
+    for i in range(1, m):
+        ci = c[i]
+        pc = c[i - 1]
+        v1 = v1 + k1 * (ci - v1)
+        v2 = v2 + k2 * (ci - v2)
+        ch = ci - pc
+        up = (up * (n_rsi - 1) + (ch if ch > 0.0 else 0.0)) / n_rsi
+        dn = (dn * (n_rsi - 1) + (-ch if ch < 0.0 else 0.0)) / n_rsi
+        tr = max(h[i] - lo[i], abs(h[i] - pc), abs(lo[i] - pc))
+        va = va + a_atr * (tr - va)
+        e1[i] = v1
+        e2[i] = v2
+        rs[i] = 100.0 - 100.0 / (1.0 + up / max(1e-12, dn))
+        at[i] = va
+    return e1, e2, rs, at
+
+
+def _ewm(x: np.ndarray, alpha: float) -> np.ndarray:
+    """``out[i] = out[i-1] + alpha * (x[i] - out[i-1])`` seeded with ``x[0]``."""
+    if len(x) == 0:
+        return x
+    return ewm_iir(x, alpha, x[0])
+
 
-    def rsi(closes: List[float], n: int) -> List[float]:
-        n = max(1, int(n))
-        rsis = []
-        up = 0.0
-        dn = 0.0
-        for i in range(len(closes)):
-            if i == 0:
-                rsis.append(50.0)
-                continue
-            ch = closes[i] - closes[i - 1]
-            up = (up * (n - 1) + max(0.0, ch)) / n
-            dn = (dn * (n - 1) + max(0.0, -ch)) / n
-            rs = up / max(1e-12, dn)
-            rsis.append(100.0 - 100.0 / (1.0 + rs))
-        return rsis
-
-    def atr(highs: List[float], lows: List[float], closes: List[float], n: int) -> List[float]:
-        n = max(1, int(n))
-        if not highs or not lows or not closes:
-            return []
-        tr: List[float] = []
-        for i in range(len(closes)):
-            if i == 0:
-                tr.append(float(highs[i]) - float(lows[i]))
-            else:
-                h = float(highs[i])
-                low = float(lows[i])
-                pc = float(closes[i - 1])
-                tr.append(max(h - low, abs(h - pc), abs(low - pc)))
-        # Wilder's smoothing (EMA with alpha = 1/n)
-        out = []
-        alpha = 1.0 / float(n)
-        for i, v in enumerate(tr):
-            if i == 0:
-                out.append(float(v))
-            else:
-                out.append(out[-1] + alpha * (float(v) - out[-1]))
+def _ema(c: np.ndarray, n: int) -> np.ndarray:
+    n = max(1, int(n))
+    return _ewm(c, 2.0 / (n + 1.0))
+
+
+def _rsi(c: np.ndarray, n: int) -> np.ndarray:
+    n = max(1, int(n))
+    out = np.full(len(c), 50.0)
+    if len(c) < 2:
         return out
+    d = np.diff(c)
+    up = wilder(np.maximum(d, 0.0), 0.0, n)
+    dn = wilder(np.maximum(-d, 0.0), 0.0, n)
+    out[1:] = 100.0 - 100.0 / (1.0 + up / np.maximum(dn, 1e-12))
+    return out
+
+
+def _atr(h: np.ndarray, lo: np.ndarray, c: np.ndarray, n: int) -> np.ndarray:
+    n = max(1, int(n))
+    if len(h) == 0 or len(lo) == 0 or len(c) == 0:
+        return np.empty(0)
+    m = len(c)
+    h, lo = h[:m], lo[:m]
+    tr = h - lo
+    pc = c[:-1]
+    tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - pc), np.abs(lo[1:] - pc)))
+    # Wilder's smoothing (EMA with alpha = 1/n)
+    return _ewm(tr, 1.0 / float(n))
 
+
+def build_features(tf5: Dict[str, List[float]]) -> Dict[str, np.ndarray]:
+    """EMA8/EMA20/RSI14/ATR14 as float32 arrays (computed in float64, cast on return)."""
+    c = as_f64(tf5.get("close", []))
+    h = as_f64(tf5.get("high", []))
+    lo = as_f64(tf5.get("low", []))
+
+    m = len(c)
+    if HAS_NUMBA and m and len(h) == m and len(lo) == m:
+        e8, e20, r14, a14 = _features_kernel(c, h, lo, 8, 20, 14, 14)
+    else:
+        e8, e20, r14, a14 = _ema(c, 8), _ema(c, 20), _rsi(c, 14), _atr(h, lo, c, 14)
     return {
-        "EMA8": ema(closes, 8),
-        "EMA20": ema(closes, 20),
-        "RSI14": rsi(closes, 14),
-        "ATR14": atr(highs, lows, closes, 14),
+        "EMA8": e8.astype(np.float32),
+        "EMA20": e20.astype(np.float32),
+        "RSI14": r14.astype(np.float32),
+        "ATR14": a14.astype(np.float32),
     }
+
+
+def build_features_list(tf5: Dict[str, List[float]]) -> Dict[str, List[float]]:
+    """``build_features`` in the legacy list-of-floats shape."""
+    return {k: v.tolist() for k, v in build_features(tf5).items()}
@@ -1,8 +1,38 @@
 from __future__ import annotations
 
 import math
-from typing import List
 
+import numpy as np
+from numpy.typing import ArrayLike
 
-def lorentz_distance(a: List[float], b: List[float]) -> float:
-    return sum(math.log(1.0 + abs(a[i] - b[i])) for i in range(min(len(a), len(b))))
+from .._njit import HAS_NUMBA, njit
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _lorentz_distances_kernel(X: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Row-wise ``sum(log1p(|X[i] - q|))``; the caller guarantees ``X.shape[1] == q.size``."""
+    m, d = X.shape
+    out = np.empty(m)
+    for i in range(m):
+        s = 0.0
+        for j in range(d):
+            s += math.log1p(abs(X[i, j] - q[j]))
+        out[i] = s
+    return out
+
+
+def lorentz_distance(a: ArrayLike, b: ArrayLike) -> float:
+    """``sum(log(1 + |a - b|))`` over the common prefix of ``a`` and ``b``."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    n = min(a.size, b.size)
+    return float(np.log1p(np.abs(a[:n] - b[:n])).sum())
+
+
+def lorentz_distances(X: ArrayLike, q: ArrayLike) -> np.ndarray:
+    """``lorentz_distance(row, q)`` for every row of the ``(N, D)`` matrix ``X``."""
+    X = np.asarray(X, dtype=np.float64)
+    q = np.asarray(q, dtype=np.float64)
+    if HAS_NUMBA and X.ndim == 2 and q.ndim == 1 and X.shape[1] == q.size:
+        return _lorentz_distances_kernel(X, q)
+    return np.log1p(np.abs(X - q)).sum(axis=1)
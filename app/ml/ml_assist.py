@@ -1,8 +1,11 @@
 # app/ml/ml_assist.py — lightweight, safe ML assist for TrendScalp
 from __future__ import annotations
 
+import os
 from typing import Any, Iterable, Sequence
 
+import numpy as np
+
 try:
     import joblib
 
@@ -11,23 +14,28 @@ except Exception:
     _HAVE_SK = False
 
 
+_MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "tp1_model.pkl")
 _model = None
+_model_tried = False
+_predict = None  # bound _model.predict_proba
+
+_NO_META: dict = {}
 
 
 def _load_model():
-    global _model
-    if _model is not None:
+    """Load the TP1 model once per process; a missing/broken model is not retried."""
+    global _model, _model_tried, _predict
+    if _model_tried:
         return _model
+    _model_tried = True
     if not _HAVE_SK:
-        _model = None
         return None
     try:
-        import os
-
-        here = os.path.dirname(__file__)
-        _model = joblib.load(os.path.join(here, "models", "tp1_model.pkl"))
+        # Memory-map the estimator's arrays so forked workers share the page cache
+        _model = joblib.load(_MODEL_PATH, mmap_mode="r")
+        _predict = _model.predict_proba
     except Exception:
-        _model = None
+        _model = _predict = None
     return _model
 
 
@@ -36,24 +44,44 @@ def score_tp1_probability(**features: Any) -> float:
 
     Falls back to a neutral probability (0.55) if the model is missing or an error occurs.
     """
-    m = _load_model()
-    if m is None:
+    if _load_model() is None or _predict is None:
         return 0.55
-    xs = [
-        float(features.get("price", 0.0)),
-        float(features.get("entry", 0.0)),
-        float(features.get("sl", 0.0)),
-        float(features.get("tp1", 0.0) or 0.0),
-        float((features.get("meta", {}) or {}).get("atr5", 0.0)),
-        float((features.get("meta", {}) or {}).get("adx14", 0.0)),
-    ]
+    meta = features.get("meta") or _NO_META
+    x = np.array(
+        [
+            [
+                float(features.get("price", 0.0)),
+                float(features.get("entry", 0.0)),
+                float(features.get("sl", 0.0)),
+                float(features.get("tp1", 0.0) or 0.0),
+                float(meta.get("atr5", 0.0)),
+                float(meta.get("adx14", 0.0)),
+            ]
+        ],
+        dtype=np.float64,
+    )
     try:
-        p = float(m.predict_proba([xs])[0][1])
+        p = float(_predict(x)[0, 1])
         return max(0.05, min(0.95, p))
     except Exception:
         return 0.55
 
 
+def score_tp1_probability_batch(feats: np.ndarray) -> np.ndarray:
+    """``score_tp1_probability`` for N candidates at once.
+
+    ``feats`` is ``(N, 6)`` in feature order (price, entry, sl, tp1, atr5, adx14);
+    one ``predict_proba`` call amortizes sklearn's input validation over the batch.
+    """
+    x = np.asarray(feats, dtype=np.float64).reshape(-1, 6)
+    if _load_model() is None or _predict is None:
+        return np.full(len(x), 0.55)
+    try:
+        return np.clip(_predict(x)[:, 1], 0.05, 0.95)
+    except Exception:
+        return np.full(len(x), 0.55)
+
+
 # === Lightweight, reusable helpers (no new deps) ============================
 
 
@@ -79,8 +107,9 @@ def ema_aligned(price: float, ema: float | None, side: str, tol_pct: float = 0.0
 def adx_slope(series: Sequence[float] | Iterable[float], bars: int = 3) -> float:
     """Short-horizon ADX slope: last - last-bars. Returns 0.0 on error/short series."""
     try:
-        seq = list(series)
-        if not seq or len(seq) <= bars:
+        # Index sequences/arrays in place; only one-shot iterables need materializing
+        seq = series if isinstance(series, (Sequence, np.ndarray)) else list(series)
+        if len(seq) <= bars:
             return 0.0
         return float(seq[-1] - seq[-1 - bars])
     except Exception:
@@ -98,8 +127,9 @@ def effective_adx_min(adx_last: float, base_min: float, slope: float, bonus: flo
 def coalesce_series(meta: dict | None, feats: dict | None, key: str) -> list[float]:
     """Pull a numeric series from meta first, then feats. Returns [] if missing."""
     try:
-        m = meta or {}
-        f = feats or {}
-        return list(m.get(key) or f.get(key) or [])
+        v = (meta or _NO_META).get(key)
+        if v is None or len(v) == 0:
+            v = (feats or _NO_META).get(key)
+        return list(v) if v is not None else []
     except Exception:
         return []
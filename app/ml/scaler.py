@@ -4,11 +4,24 @@ from typing import List
 
 
 class IdentityScaler:
+    """Stateless pass-through scaler; share ``identity_scaler()`` instead of instantiating."""
+
+    __slots__ = ()
+
     def fit(self, X: List[List[float]]) -> "IdentityScaler":
         return self
 
-    def transform(self, X: List[List[float]]) -> List[List[float]]:
+    @staticmethod
+    def transform(X: List[List[float]]) -> List[List[float]]:
         return X
 
-    def fit_transform(self, X: List[List[float]]) -> List[List[float]]:
+    @staticmethod
+    def fit_transform(X: List[List[float]]) -> List[List[float]]:
         return X
+
+
+_IDENTITY = IdentityScaler()
+
+
+def identity_scaler() -> IdentityScaler:
+    return _IDENTITY
@@ -4,12 +4,18 @@ import json
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# Both accept the raw bytes of the file
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 def load_meta(artifact_dir: Path) -> Optional[dict[str, Any]]:
-    meta_path = artifact_dir / "meta.json"
-    if not meta_path.exists():
-        return None
     try:
-        return json.loads(meta_path.read_text())
+        return _loads((artifact_dir / "meta.json").read_bytes())
     except Exception:
+        # Missing file or bad JSON
         return None
@@ -1,19 +1,21 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple
+from typing import Iterator, Tuple
+
+import numpy as np
 
 
 def walkforward_splits(
     n: int, folds: int = 5, min_train: int = 500, step: int = 200
-) -> Iterable[Tuple[List[int], List[int]]]:
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
     """
     Yield (train_idx, val_idx) splits for walk-forward validation.
-    Minimal placeholder with index ranges.
+    Minimal placeholder with int64 index ranges (ready for ``X[idx]``).
     """
     start = min_train
     while start + step < n and folds > 0:
-        train_idx = list(range(0, start))
-        val_idx = list(range(start, min(n, start + step)))
+        train_idx = np.arange(0, start, dtype=np.int64)
+        val_idx = np.arange(start, min(n, start + step), dtype=np.int64)
         yield train_idx, val_idx
         start += step
         folds -= 1
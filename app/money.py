@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import Tuple
 
 from . import config as C
@@ -40,10 +41,12 @@ def _f(x, d=0.0):
 
 
 # Interpret SL minimum either via percent (PCT) or raw fraction (FRAC)
+@lru_cache(maxsize=1)
 def _min_sl_fraction() -> float:
     """Return a *fraction of entry* to use as the minimum SL distance.
     Priority:
       MIN_SL_FRAC (e.g., 0.005 for 0.5%) > MIN_SL_PCT/100 (e.g., 0.5 -> 0.005).
+    Read from the environment once; call ``refresh_env()`` after changing it.
     """
     try:
         frac = _f(os.getenv("MIN_SL_FRAC", None), -1.0)
@@ -59,6 +62,11 @@ def _min_sl_fraction() -> float:
     return float(MIN_SL_PCT) / 100.0
 
 
+def refresh_env() -> None:
+    """Drop the cached MIN_SL_FRAC/MIN_SL_PCT reading so the next sizing call re-reads it."""
+    _min_sl_fraction.cache_clear()
+
+
 # -----------------------
 # Fees & PnL
 # -----------------------
@@ -94,12 +102,24 @@ def calc_pnl(side: str, entry: float, exit_px: float, qty: float) -> float:
         return (e - x) * q
 
 
+def _pnl_and_fees(side: str, entry: float, exit_px: float, qty: float) -> Tuple[float, float]:
+    """``(calc_pnl(...), calc_fees(...))`` with the inputs coerced once."""
+    e = _f(entry)
+    x = _f(exit_px)
+    q = _f(qty)
+    if e <= 0 or q <= 0:
+        return 0.0, 0.0
+    g = (x - e) * q if (side or "").upper() == "LONG" else (e - x) * q
+    if x <= 0:
+        return g, 0.0
+    return g, float(-(e * q * FEE_RATE_PER_SIDE + x * q * FEE_RATE_PER_SIDE))
+
+
 def calc_pnl_net(side: str, entry: float, exit_px: float, qty: float) -> float:
     """
     Net PnL = gross + fees (fees is already negative)
     """
-    g = calc_pnl(side, entry, exit_px, qty)
-    f = calc_fees(entry, exit_px, qty)
+    g, f = _pnl_and_fees(side, entry, exit_px, qty)
     return g + f
 
 
@@ -214,7 +234,5 @@ def summarize_trade(
     """
     Returns (gross, fees, net)
     """
-    g = calc_pnl(side, entry, exit_px, qty)
-    f = calc_fees(entry, exit_px, qty)
-    n = g + f
-    return (g, f, n)
+    g, f = _pnl_and_fees(side, entry, exit_px, qty)
+    return (g, f, g + f)
@@ -1,11 +1,17 @@
 # app/engines/trendscalp/regime.py
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Series arguments may be lists or float64 ndarrays: emptiness is tested with len(),
+# and scalars read from them are cast with float() so diagnostics stay plain floats.
+FloatSeries = Union[Sequence[float], np.ndarray]
 
 
 def classify(
-    adx_series: List[float],
-    atr_series: List[float],
-    closes: List[float],
+    adx_series: FloatSeries,
+    atr_series: FloatSeries,
+    closes: FloatSeries,
     ema200_last: float,
     prev: Optional[str],
     *,
@@ -31,7 +37,7 @@ def classify(
       regime: 'RUNNER' or 'CHOP'
       dbg:    diagnostics for telemetry
     """
-    if not adx_series or not atr_series or not closes:
+    if len(adx_series) == 0 or len(atr_series) == 0 or len(closes) == 0:
         return (prev or "CHOP"), {"adx": 0.0, "atr_pct": 0.0, "ema_side": 0.0, "ema_slope": 0.0}
 
     adx = float(adx_series[-1])
@@ -43,18 +49,17 @@ def classify(
     ema_side = 1.0 if price >= float(ema200_last) else -1.0
     close_slope = 0.0
     if len(closes) >= 2:
-        close_slope = 1.0 if closes[-1] > closes[-2] else -1.0
+        close_slope = 1.0 if price > closes[-2] else -1.0
 
     # Hysteresis decisions
     want_runner = (adx >= adx_up) and (atr_pct >= atr_up) and (ema_side * close_slope >= 0.0)
     want_chop = (adx <= adx_dn) or (atr_pct <= atr_dn)
 
+    # RUNNER holds until a downgrade; CHOP (and unknown) upgrades only on want_runner
     if prev == "RUNNER":
         regime = "CHOP" if want_chop else "RUNNER"
-    elif prev == "CHOP":
-        regime = "RUNNER" if want_runner else "CHOP"
     else:
-        regime = "RUNNER" if want_runner else ("CHOP" if want_chop else "CHOP")
+        regime = "RUNNER" if want_runner else "CHOP"
 
     dbg = {
         "adx": round(adx, 3),
@@ -72,10 +77,10 @@ def classify(
 # --- PEV-support helpers (dependency-light) ---------------------------------
 
 
-def adx_slope(adx_series: List[float], bars: int = 3) -> float:
+def adx_slope(adx_series: FloatSeries, bars: int = 3) -> float:
     """Return short-horizon ADX slope (last - last-bars). If not enough data, 0.0."""
     try:
-        if not adx_series or len(adx_series) <= bars:
+        if len(adx_series) <= bars:
             return 0.0
         return float(adx_series[-1] - adx_series[-1 - bars])
     except Exception:
@@ -83,9 +88,9 @@ def adx_slope(adx_series: List[float], bars: int = 3) -> float:
 
 
 def soft_degrade(
-    adx_series: List[float],
-    atr_series: List[float],
-    closes: List[float],
+    adx_series: FloatSeries,
+    atr_series: FloatSeries,
+    closes: FloatSeries,
     *,
     adx_min: float,
     atr_floor_pct: float,
@@ -99,7 +104,7 @@ def soft_degrade(
       - Compute effective ADX min with a small slope bonus if ADX rising over ~3 bars.
       - Mark soft=True if ADX < adx_min_eff OR ATR% < atr_floor_pct.
     """
-    if not adx_series or not atr_series or not closes:
+    if len(adx_series) == 0 or len(atr_series) == 0 or len(closes) == 0:
         return {
             "soft": True,
             "adx": 0.0,
@@ -5,7 +5,7 @@ from __future__ import annotations  # noqa: I001
 import asyncio
 import time
 from math import isfinite
-from typing import Any, List, Callable, Optional
+from typing import Any, Callable, Optional
 
 # Third-party
 import ccxt
@@ -14,13 +14,15 @@ import ccxt
 from app import config as C
 from app import db, telemetry
 from app.components.guards import guard_sl, post_entry_validity
+from app.data import OhlcvRing
 
 # regime-based exit/partial helpers
 from app.execution import ensure_partial_tp1, exit_remainder_market
-from app.indicators import rsi_compact
+from app.indicators import as_f64
 from app.managers.trendscalp_fsm import (
     Context,
     build_entry_validity_snapshot,
+    build_features,
     is_hard_invalidation,  # NEW
     propose,
 )
@@ -169,6 +171,12 @@ async def run_trendscalp_manage(
     bars_since_tp1 = 0
     _last_seen_bar_ts = None
 
+    # Per-trade OHLCV windows: after the first poll only the newest bars are fetched
+    ring_1m = OhlcvRing("1m", 240)
+    ring_5m = OhlcvRing("5m", 220)
+    ring_15m = OhlcvRing("15m", 220)
+    ring_1h = OhlcvRing("1h", 200)
+
     # Milestone mode (toggle via env). If disabled, we rely on FSM SL proposals entirely.
     MS_MODE = bool(getattr(C, "TS_MILESTONE_MODE", True))
     # milestone every 0.5R beyond TP1
@@ -405,8 +413,8 @@ async def run_trendscalp_manage(
         except Exception:
             pass
 
-        # Pull a longer 1m window so FSM can do structure‑trail and stall detection
-        tf1m = fetch_ohlcv(ex, "1m", 240)
+        # Pull a longer 1m window so FSM can do structure‑trail
+        tf1m = ring_1m.update(fetch_ohlcv, ex)
         highs = tf1m.get("high") or []
         lows = tf1m.get("low") or []
         closes = tf1m.get("close") or []
@@ -420,11 +428,7 @@ async def run_trendscalp_manage(
         lo = float(lows[-1])
         px = float(closes[-1])
 
-        # Compute RSI14 series for stall confirmation in FSM via shared indicators helper
-        try:
-            tf1m["rsi14"] = rsi_compact([float(x) for x in closes], 14) or []
-        except Exception:
-            tf1m["rsi14"] = []
+        fsm_cache = build_features(tf1m)
 
         # Track bar changes to count bars_since_tp1 for the FSM grace window
         try:
@@ -488,9 +492,9 @@ async def run_trendscalp_manage(
 
         # Higher TFs + indicators (gives the FSM its meta signals, incl. ATR/ADX)
         try:
-            tf5 = fetch_ohlcv(ex, "5m", 220)
-            tf15 = fetch_ohlcv(ex, "15m", 220)
-            tf1h = fetch_ohlcv(ex, "1h", 200)
+            tf5 = ring_5m.update(fetch_ohlcv, ex)
+            tf15 = ring_15m.update(fetch_ohlcv, ex)
+            tf1h = ring_1h.update(fetch_ohlcv, ex)
             feats = indicators(tf5, tf15, tf1h)  # must at least provide atr5, adx14
         except Exception as e:
             telemetry.log(
@@ -585,7 +589,7 @@ async def run_trendscalp_manage(
                     # HARD: EMA-side flip (5m or 15m) + structure break on 1m with ATR pad
                     if "hard" not in pev_diag:
                         hard_diag = is_hard_invalidation(
-                            px, is_long, getattr(draft, "meta", {}) or {}, tf1m
+                            px, is_long, getattr(draft, "meta", {}) or {}, tf1m, fsm_cache
                         )
                         for k, v in hard_diag.items():
                             if k not in pev_diag:
@@ -605,20 +609,15 @@ async def run_trendscalp_manage(
                         )
                         closes_series_raw = tf5.get("close") if isinstance(tf5, dict) else []
 
-                        adx_series_f: List[float] = (
-                            [float(x) for x in adx_series_raw]
-                            if isinstance(adx_series_raw, list)
-                            else []
+                        # One C-level float64 cast per series instead of a per-item float()
+                        adx_series_f = as_f64(
+                            adx_series_raw if isinstance(adx_series_raw, list) else []
                         )
-                        atr_series_f: List[float] = (
-                            [float(x) for x in atr_series_raw]
-                            if isinstance(atr_series_raw, list)
-                            else []
+                        atr_series_f = as_f64(
+                            atr_series_raw if isinstance(atr_series_raw, list) else []
                         )
-                        closes_series_f: List[float] = (
-                            [float(x) for x in closes_series_raw]
-                            if isinstance(closes_series_raw, list)
-                            else []
+                        closes_series_f = as_f64(
+                            closes_series_raw if isinstance(closes_series_raw, list) else []
                         )
 
                         adx_min = float(getattr(C, "TS_ADX_MIN", 22.0))
@@ -821,7 +820,7 @@ async def run_trendscalp_manage(
 
         # Ask FSM for proposals (pure function, no side-effects)
         try:
-            prop = propose(ctx)
+            prop = propose(ctx, fsm_cache)
         except Exception as e:
             telemetry.log("manage", "FSM_ERROR", str(e), {"engine": "trendscalp", "tid": trade_id})
             prop = None
@@ -72,10 +72,9 @@ class ScalpBrain:
 
 
 def _safe_rsi(tf):
-    from .indicators import rsi
+    from .indicators import last_or_none, rsi
 
-    rs = rsi(tf["close"], 14)
-    return rs[-1] if rs else None
+    return last_or_none(rsi(tf["close"], 14))
 
 
 def _slope(series: List[float], n: int) -> float:
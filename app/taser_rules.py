@@ -4,7 +4,7 @@ from typing import Dict, List, Optional
 
 from . import config as C
 from .analytics import build_liquidity_heatmap
-from .indicators import anchored_vwap, macd, rsi, vwap
+from .indicators import anchored_vwap, last_or_none, macd, rsi, vwap
 
 
 @dataclass
@@ -560,13 +560,12 @@ def taser_signal(
 
     # RSI with fallback
     rsi15 = rsi(closes15, 14)
-    if rsi15 and len(rsi15) >= 1:
-        rsi_now = rsi15[-1]
+    if rsi15.size >= 1:
+        rsi_now = last_or_none(rsi15)
         rsi_tf_used = "15m"
     else:
         # graceful fallback to 5m RSI if 15m history is insufficient
-        rsi5 = rsi(closes5, 14)
-        rsi_now = rsi5[-1] if rsi5 else None
+        rsi_now = last_or_none(rsi(closes5, 14))
         rsi_tf_used = "5m_fallback"
 
     macd_line, signal_line, macd_hist = macd(closes5)
@@ -574,8 +573,8 @@ def taser_signal(
     hi_idx, lo_idx = last_major_swings(closes5, 150)
     avwap_hi = anchored_vwap(highs5, lows5, closes5, vols5, hi_idx)
     avwap_lo = anchored_vwap(highs5, lows5, closes5, vols5, lo_idx)
-    avhi = avwap_hi[-1] if avwap_hi and len(avwap_hi) == len(closes5) else None
-    avlo = avwap_lo[-1] if avwap_lo and len(avwap_lo) == len(closes5) else None
+    avhi = last_or_none(avwap_hi) if len(avwap_hi) == len(closes5) else None
+    avlo = last_or_none(avwap_lo) if len(avwap_lo) == len(closes5) else None
     vwp = vwap5[-1] if vwap5 else None
 
     atr = _atr(highs5, lows5, 30)
@@ -1,11 +1,13 @@
 # app/telemetry.py
+import atexit
 import csv
 import json
 import sqlite3
 import threading
 import time
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from . import config as C
 
@@ -31,6 +33,10 @@ TEL = {
 }
 
 
+# Master switch: hot paths check this before building payloads; log() is a no-op when off.
+ENABLED: bool = bool(getattr(C, "TELEMETRY_ENABLED", True))
+
+
 def _safe_payload(d: Dict[str, Any] | None) -> Dict[str, Any]:
     try:
         return dict(d or {})
@@ -79,25 +85,63 @@ def init_telemetry():
         print("[TELEMETRY INIT ERROR]", e, flush=True)
 
 
-def log(component: str, tag: str, message: str, payload: Dict[str, Any] | None = None):
-    """Write a telemetry entry. Always safe (catches JSON/DB errors)."""
-    try:
-        payload_str = json.dumps(payload or {}, default=str)
-    except Exception as e:
-        payload_str = json.dumps({"_error": f"json:{e}"})
+_SQL_INSERT = "INSERT INTO telemetry(ts,component,tag,message,payload_json) VALUES(?,?,?,?,?)"
 
+# Write buffer: log() only serializes and enqueues; a background timer commits the
+# pending rows in one transaction FLUSH_MS after the first one. Once MAX_PENDING rows
+# are queued, log() flushes inline instead of letting the buffer grow. Reads flush first.
+FLUSH_MS = 250
+MAX_PENDING = 1024
+
+_pending: Deque[Tuple] = deque()
+_timer: Optional[threading.Timer] = None
+_TIMER_LOCK = threading.Lock()
+
+
+def flush() -> None:
+    """Commit all buffered telemetry rows. Always safe (catches DB errors)."""
+    global _timer
+    with _TIMER_LOCK:
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    rows = []
+    while _pending:
+        rows.append(_pending.popleft())
+    if not rows:
+        return
     try:
         with _lock, _conn() as con:
-            cur = con.cursor()
-            cur.execute(
-                "INSERT INTO telemetry(ts,component,tag,message,payload_json) VALUES(?,?,?,?,?)",
-                (int(time.time() * 1000), component, tag, message, payload_str),
-            )
+            con.executemany(_SQL_INSERT, rows)
             con.commit()
     except Exception as e:
         print("[TELEMETRY ERROR]", e, flush=True)
 
 
+atexit.register(flush)
+
+
+def log(component: str, tag: str, message: str, payload: Dict[str, Any] | None = None):
+    """Queue a telemetry entry for the background writer. Always safe (catches JSON errors)."""
+    global _timer
+    if not ENABLED:
+        return
+    try:
+        payload_str = json.dumps(payload or {}, default=str)
+    except Exception as e:
+        payload_str = json.dumps({"_error": f"json:{e}"})
+
+    _pending.append((int(time.time() * 1000), component, tag, message, payload_str))
+    if len(_pending) >= MAX_PENDING:
+        flush()
+        return
+    with _TIMER_LOCK:
+        if _timer is None:
+            _timer = threading.Timer(FLUSH_MS / 1000.0, flush)
+            _timer.daemon = True
+            _timer.start()
+
+
 # Structured engine event logger (auto-injects tags for engine/exchange/symbol/trade_id)
 def elog(
     component: str,
@@ -138,6 +182,7 @@ def log_exception(component: str, tag: str, exc: Exception, extra: Dict[str, Any
 
 def recent(limit: int = 100) -> List[dict]:
     """Fetch recent telemetry rows (most recent first)."""
+    flush()
     try:
         with _lock, _conn() as con:
             cur = con.cursor()
@@ -164,6 +209,7 @@ def recent(limit: int = 100) -> List[dict]:
 
 def purge(older_than_ms: int):
     """Delete telemetry entries older than a given epoch ms (housekeeping)."""
+    flush()
     try:
         with _lock, _conn() as con:
             cur = con.cursor()
@@ -427,6 +473,7 @@ def window(
     limit: int = 100000,
 ) -> List[dict]:
     """Fetch telemetry in a specific window (inclusive start, exclusive end)."""
+    flush()
     try:
         with _lock, _conn() as con:
             cur = con.cursor()
@@ -11,6 +11,7 @@ default for TrendScalp**
 """
 
 import math  # noqa: I001
+import numpy as np
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Callable, Tuple, cast
 
 
@@ -26,8 +27,6 @@ else:
         # Runtime fallback only; mypy won't analyze this branch.
         C = _importlib.import_module("config")
 
-from typing import TYPE_CHECKING
-
 if TYPE_CHECKING:
     from app.taser_rules import Signal
 else:
@@ -62,9 +61,22 @@ else:
 
         telemetry = _importlib.import_module("telemetry")
 
-# --- regime classification import ---
+# --- regime classification / ANN distance imports ---
+from app.ml.knn_lorentz import lorentz_distances
 from app.regime import classify as classify_regime
 
+# --- ML gate: resolved once at import, not on every scan ---
+_ml_infer: Optional[
+    Callable[
+        [Dict[str, List[float]], Optional[Dict[str, List[float]]], Optional[str]],
+        Tuple[str, float, Optional[str]],
+    ]
+]
+try:
+    from app.trendscalp_ml_gate import infer_bias_conf as _ml_infer
+except Exception:  # pragma: no cover
+    _ml_infer = None
+
 # --- helpers: safe config coercion ---
 
 
@@ -274,10 +286,6 @@ def _feature_series(closes, highs, lows) -> Dict[str, List[float]]:
     }
 
 
-def _lorentz_distance(vec_now: List[float], vec_hist: List[float]) -> float:
-    return sum(math.log(1.0 + abs(vec_now[i] - vec_hist[i])) for i in range(len(vec_now)))
-
-
 def _ann_predict(
     closes, highs, lows, k: int, max_back: int, feature_count: int
 ) -> Tuple[int, float]:
@@ -292,12 +300,11 @@ def _ann_predict(
     last_d = -1.0
     back = min(max_back, n - 5)
     start = n - back
-    for i in range(start, n - 5):
-        if i % 4 != 0:
-            continue
-        vec = [s[i] for s in series]
-        now = [s[-1] for s in series]
-        d = _lorentz_distance(now, vec)
+    # Every 4th bar in the lookback; distances to the latest bar in one vectorized pass
+    idx = range(start + (-start) % 4, n - 5, 4)
+    X = np.array(series, dtype=np.float64).T
+    dist = lorentz_distances(X[idx.start : idx.stop : 4], X[-1]).tolist()
+    for i, d in zip(idx, dist):
         if d >= last_d:
             last_d = d
             dists.append(d)
@@ -447,17 +454,6 @@ def scalp_signal(
         return Signal("NONE", 0, 0, [], "trendscalp: same 5m bar", {"engine": "trendscalp"})
 
     # ML Lorentzian bias (patched: use library gate if enabled)
-    _ml_infer: Optional[
-        Callable[
-            [Dict[str, List[float]], Optional[Dict[str, List[float]]], Optional[str]],
-            Tuple[str, float, Optional[str]],
-        ]
-    ] = None
-    try:
-        from app.trendscalp_ml_gate import infer_bias_conf as _ml_infer
-    except Exception:
-
-        _ml_infer = None
     ml_bias = "neutral"
     ml_sum = 0.0
     ml_conf = 0.0
@@ -1165,23 +1161,29 @@ def scalp_manage(
             tl_break = tl_break_now
         if tl_break or ema_dn:
             mr = _move_r(px_ref, entry, sl)
-            context_ok = (adx_last >= rev_adx_min) and (
-                px_ref <= ema200_5
-            )  # only flip short if below 200-EMA(5m) and ADX strong
-            if mr >= REV_MIN_R and context_ok:
+            ema200_ok = px_ref <= ema200_5
+            # only flip short if below 200-EMA(5m) and ADX strong
+            context_ok = (adx_last >= rev_adx_min) and ema200_ok
+            allowed = mr >= REV_MIN_R and context_ok
+            if telemetry.ENABLED:
                 try:
                     telemetry.log_reverse(
                         engine="trendscalp",
-                        allowed=True,
+                        allowed=allowed,
                         move_r=mr,
                         adx=adx_last,
-                        ema200_ok=(px_ref <= ema200_5),
+                        ema200_ok=ema200_ok,
                         tl_confirm_bars=_env_int("TS_EXIT_CONFIRM_BARS", 2),
                         tl_break_atr_mult=float(getattr(C, "TS_REVERSAL_ATR_PAD", 0.2)),
-                        why="TL/EMA down confirmed",
+                        why=(
+                            "TL/EMA down confirmed"
+                            if allowed
+                            else "mr/ADX/EMA context insufficient"
+                        ),
                     )
                 except Exception:
                     pass
+            if allowed:
                 exit_now = True
                 why.append(
                     "reverse: TL/EMA down (confirmed) | "
@@ -1189,23 +1191,10 @@ def scalp_manage(
                     f"ADX={adx_last:.1f}≥{rev_adx_min}, 200EMA ok"
                 )
             else:
-                try:
-                    telemetry.log_reverse(
-                        engine="trendscalp",
-                        allowed=False,
-                        move_r=mr,
-                        adx=adx_last,
-                        ema200_ok=(px_ref <= ema200_5),
-                        tl_confirm_bars=_env_int("TS_EXIT_CONFIRM_BARS", 2),
-                        tl_break_atr_mult=float(getattr(C, "TS_REVERSAL_ATR_PAD", 0.2)),
-                        why="mr/ADX/EMA context insufficient",
-                    )
-                except Exception:
-                    pass
                 why.append(
                     "no reverse: "
                     f"moveR={mr:.2f}, ADX={adx_last:.1f}, "
-                    f"200EMA test={(px_ref <= ema200_5)}"
+                    f"200EMA test={ema200_ok}"
                 )
     else:
         cand = upper_now + pad
@@ -1268,23 +1257,27 @@ def scalp_manage(
             tl_break = tl_break_now
         if tl_break or ema_up:
             mr = _move_r(px_ref, entry, sl)
-            context_ok = (adx_last >= rev_adx_min) and (
-                px_ref >= ema200_5
-            )  # only flip long if above 200-EMA(5m) and ADX strong
-            if mr >= REV_MIN_R and context_ok:
+            ema200_ok = px_ref >= ema200_5
+            # only flip long if above 200-EMA(5m) and ADX strong
+            context_ok = (adx_last >= rev_adx_min) and ema200_ok
+            allowed = mr >= REV_MIN_R and context_ok
+            if telemetry.ENABLED:
                 try:
                     telemetry.log_reverse(
                         engine="trendscalp",
-                        allowed=True,
+                        allowed=allowed,
                         move_r=mr,
                         adx=adx_last,
-                        ema200_ok=(px_ref >= ema200_5),
+                        ema200_ok=ema200_ok,
                         tl_confirm_bars=_env_int("TS_EXIT_CONFIRM_BARS", 2),
                         tl_break_atr_mult=float(getattr(C, "TS_REVERSAL_ATR_PAD", 0.2)),
-                        why="TL/EMA up confirmed",
+                        why=(
+                            "TL/EMA up confirmed" if allowed else "mr/ADX/EMA context insufficient"
+                        ),
                     )
                 except Exception:
                     pass
+            if allowed:
                 exit_now = True
                 why.append(
                     "reverse: TL/EMA up (confirmed) | "
@@ -1292,23 +1285,10 @@ def scalp_manage(
                     f"ADX={adx_last:.1f}≥{rev_adx_min}, 200EMA ok"
                 )
             else:
-                try:
-                    telemetry.log_reverse(
-                        engine="trendscalp",
-                        allowed=False,
-                        move_r=mr,
-                        adx=adx_last,
-                        ema200_ok=(px_ref >= ema200_5),
-                        tl_confirm_bars=_env_int("TS_EXIT_CONFIRM_BARS", 2),
-                        tl_break_atr_mult=float(getattr(C, "TS_REVERSAL_ATR_PAD", 0.2)),
-                        why="mr/ADX/EMA context insufficient",
-                    )
-                except Exception:
-                    pass
                 why.append(
                     "no reverse: "
                     f"moveR={mr:.2f}, ADX={adx_last:.1f}, "
-                    f"200EMA test={(px_ref >= ema200_5)}"
+                    f"200EMA test={ema200_ok}"
                 )
 
     # --- ML degrade-tighten (optional) ---
@@ -49,10 +49,11 @@ def infer_bias_conf(
     if not use_ml:
         return "neutral", 0.0, None
 
-    closes = list(map(_safe_float, (tf5.get("close") or [])))
-    if len(closes) < int(getattr(C, "TS_ML_WARMUP_BARS", 600)):
-        # Not enough data to trust ML yet
+    raw_closes = tf5.get("close") or ()
+    if len(raw_closes) < int(getattr(C, "TS_ML_WARMUP_BARS", 600)):
+        # Not enough data to trust ML yet (checked before converting the closes)
         return "neutral", 0.0, None
+    closes = list(map(_safe_float, raw_closes))
 
     # Library hook: load model per symbol if available (placeholder)
     # In production, load from .ml/<SYMBOL>/model.pkl via app.ml.store
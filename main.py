@@ -1,7 +1,16 @@
 # app/main.py
 import asyncio
 
+from app.messenger import close_session
 from app.scheduler import run_scheduler
 
+
+async def _main() -> None:
+    try:
+        await run_scheduler()
+    finally:
+        await close_session()
+
+
 if __name__ == "__main__":
-    asyncio.run(run_scheduler())
+    asyncio.run(_main())
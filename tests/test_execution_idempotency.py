@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture()
+def paper(tmp_path, monkeypatch):
+    from app import config as C
+    from app import db, execution, telemetry
+
+    monkeypatch.setattr(C, "DB_PATH", str(tmp_path / "taser.db"))
+    monkeypatch.setattr(C, "DRY_RUN", True)
+    monkeypatch.setattr(telemetry, "log", lambda *a, **k: None)
+    db.init()
+    return db, execution
+
+
+def _sig(tps=(101.0, 102.0, 103.0)):
+    return SimpleNamespace(side="LONG", entry=100.0, sl=99.0, tps=list(tps), meta={})
+
+
+def _kinds(db, trade_id):
+    return [o["kind"] for o in db.get_orders(trade_id)]
+
+
+def test_place_bracket_skips_when_already_bracketed(paper):
+    db, execution = paper
+    first = execution.place_bracket(None, "SOLUSD", _sig(), 1.0, 7)
+    assert first
+    assert _kinds(db, 7).count("market_entry") == 1
+
+    assert execution.place_bracket(None, "SOLUSD", _sig(), 1.0, 7) == []
+    assert _kinds(db, 7).count("market_entry") == 1
+
+
+def test_ensure_partial_tp1_skips_existing_price(paper):
+    db, execution = paper
+    oid = execution.ensure_partial_tp1(None, "SOLUSD", _sig(), 9, 0.5, qty_hint=2.0)
+    assert oid
+    assert execution.ensure_partial_tp1(None, "SOLUSD", _sig(), 9, 0.5, qty_hint=2.0) is None
+    assert _kinds(db, 9) == ["take_profit_1"]
+
+    # a different TP1 price is not a duplicate
+    assert execution.ensure_partial_tp1(None, "SOLUSD", _sig((101.5,)), 9, 0.5, qty_hint=2.0)
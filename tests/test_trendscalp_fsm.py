@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+
+@pytest.fixture()
+def fsm(monkeypatch):
+    from app import config as C
+    from app.managers import trendscalp_fsm
+
+    def set_knobs(**knobs):
+        for k, v in knobs.items():
+            monkeypatch.setattr(C, k, v, raising=False)
+        trendscalp_fsm.refresh_cfg()
+
+    yield trendscalp_fsm, set_knobs
+    trendscalp_fsm.refresh_cfg()
+
+
+def _old_tps(F, ctx):
+    """TP ladder as propose() built it before the clamp was hoisted: clamped on each
+    return path, adaptive widen after TP1 only, ordered last."""
+    cfg = F._cfg()
+    is_long, meta = ctx.is_long, ctx.meta
+    tp1, tp2, tp3 = (list(ctx.tps) + [None, None, None])[:3]
+    tp1, tp2, tp3 = F.ensure_order(tp1, tp2, tp3, is_long)
+    atr5 = float(meta.get("atr5", 0.0))
+    t1, t2, t3 = F.clamp_tp1_distance(ctx.entry, ctx.sl, tp1, tp2, tp3, is_long, atr5)
+    hit_tp1 = bool(meta.get("hit_tp1", False))
+    if (not hit_tp1) and cfg.freeze_trail:
+        return F._tp_list(t1, t2, t3)
+    if hit_tp1 and int(meta.get("bars_since_tp1", 0)) < cfg.post_tp1_delay:
+        return F._tp_list(t1, t2, t3)
+    if hit_tp1 and cfg.mode_adapt_enabled and atr5 > 0.0:
+        adx14 = meta.get("adx14")
+        regime = F._detect_regime(ctx.price, atr5, None if adx14 is None else float(adx14))
+        _a1, a2, a3 = cfg.chop_tp_atr_mults if regime == "chop" else cfg.rally_tp_atr_mults
+        if is_long:
+            s2, s3 = round(ctx.entry + a2 * atr5, 4), round(ctx.entry + a3 * atr5, 4)
+            t2 = max(t2, s2) if t2 is not None else s2
+            t3 = max(t3, s3) if t3 is not None else s3
+        else:
+            s2, s3 = round(ctx.entry - a2 * atr5, 4), round(ctx.entry - a3 * atr5, 4)
+            t2 = min(t2, s2) if t2 is not None else s2
+            t3 = min(t3, s3) if t3 is not None else s3
+    return F._tp_list(*F.ensure_order(t1, t2, t3, is_long))
+
+
+def test_propose_tps_match_old_sequence(fsm):
+    F, set_knobs = fsm
+    rnd = random.Random(7)
+    for _ in range(1500):
+        set_knobs(
+            GLOBAL_NO_TRAIL_BEFORE_TP1=rnd.random() < 0.5,
+            MODE_ADAPT_ENABLED=rnd.random() < 0.5,
+            TRAIL_STYLE=rnd.choice(["structure", "fracR"]),
+            TP_LOCK_STYLE=rnd.choice(["to_tp1", "trail_fracR"]),
+        )
+        side = rnd.choice(["LONG", "SHORT"])
+        s = 1.0 if side == "LONG" else -1.0
+        entry = 100.0
+        price = entry + s * rnd.uniform(-0.5, 2.5)
+        tps = sorted(round(entry + s * rnd.uniform(0.2, 3.0), 4) for _ in range(rnd.randint(0, 3)))
+        # Steady run toward the targets with fading RSI (the old stall-take pattern)
+        closes = [price - s * 0.01 * (60 - i) for i in range(60)]
+        tf1m = {
+            "close": closes,
+            "high": [c + 0.1 for c in closes],
+            "low": [c - 0.1 for c in closes],
+            "rsi14": [60.0 - 0.5 * s * i for i in range(60)],
+        }
+        meta = {
+            "atr5": rnd.choice([0.0, 0.3, 0.8]),
+            "adx14": rnd.choice([None, 15.0, 30.0]),
+            "hit_tp1": rnd.random() < 0.6,
+            "bars_since_tp1": rnd.choice([0, 1, 5]),
+            "hit_tp2": rnd.random() < 0.3,
+            "mfe_abs": rnd.uniform(0.0, 2.0),
+        }
+        ctx = F.Context(
+            price=price,
+            side=side,
+            entry=entry,
+            sl=entry - s * rnd.uniform(0.3, 1.5),
+            tps=tps,
+            tf1m=tf1m,
+            meta=meta,
+        )
+        assert F.propose(ctx).tps == _old_tps(F, ctx)